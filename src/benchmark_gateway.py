@@ -0,0 +1,244 @@
+"""Compares the memory and the time taken to cache a few large synthetic guilds under each gateway profile.
+
+Each profile runs in its own process. The process builds a `ConnectionState` with the intents and cache options of the profile, as returned by `get_gateway_options`, and feeds it `GUILD_CREATE` payloads shaped the way Discord sends them for those intents: members are only included when the members intent is enabled and the guilds are chunked at startup, and presences only with the presences intent. The resident memory( RSS ) of the process is measured before and after caching the guilds.
+
+Usage:
+    python src/benchmark_gateway.py [--guilds 5] [--members 20000] [--channels 200] [--roles 50]
+"""
+
+import argparse
+import gc
+import json
+import os
+import pkgutil
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List
+
+import discord
+
+from utils.cfg_handler import get_config
+from utils.gateway import get_gateway_options
+
+PROFILES = ("all", "trimmed")
+
+# The join date of every synthetic member
+JOINED_AT = "2024-01-01T00:00:00+00:00"
+
+
+def get_rss() -> int:
+    """Returns the current resident memory of the process, in bytes. Only available on Linux."""
+
+    with open("/proc/self/statm") as file:
+        return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def build_guild_payload(
+    guild_id: int,
+    *,
+    members: int,
+    channels: int,
+    roles: int,
+    intents: discord.Intents,
+    chunked: bool,
+) -> Dict[str, Any]:
+    """Returns a synthetic `GUILD_CREATE` payload of a large guild, as Discord would send it with the provided intents.
+
+    Parameters
+    ----------
+    guild_id : `int`
+        The ID of the guild.
+
+    members : `int`
+        The number of members in the guild.
+
+    channels : `int`
+        The number of text channels in the guild.
+
+    roles : `int`
+        The number of roles in the guild, besides `@everyone`.
+
+    intents : `discord.Intents`
+        The intents the bot identified with.
+
+    chunked : `bool`
+        Whether the members are requested at startup. Discord only sends the members of a large guild through chunking, so they're included as if every chunk had arrived.
+
+    Returns
+    -------
+    `Dict[str, Any]`
+    """
+
+    member_payloads: List[dict] = []
+    presence_payloads: List[dict] = []
+
+    if intents.members and chunked:
+        # Every user is unique, so that each cached member holds its own user
+        for index in range(members):
+            user = {
+                "id": str(guild_id * 1_000_000 + index),
+                "username": f"user{guild_id}_{index}",
+                "discriminator": "0",
+                "global_name": f"User {index}",
+                "avatar": None,
+            }
+            member_payloads.append(
+                {
+                    "user": user,
+                    "roles": [str(guild_id + 1 + index % max(roles, 1))],
+                    "joined_at": JOINED_AT,
+                    "nick": None,
+                    "deaf": False,
+                    "mute": False,
+                    "flags": 0,
+                }
+            )
+
+            if intents.presences:
+                presence_payloads.append(
+                    {
+                        "user": {"id": user["id"]},
+                        "status": "online",
+                        "activities": [],
+                        "client_status": {"desktop": "online"},
+                    }
+                )
+
+    return {
+        "id": str(guild_id),
+        "name": f"Guild {guild_id}",
+        "owner_id": str(guild_id * 1_000_000),
+        "member_count": members,
+        "large": True,
+        "unavailable": False,
+        "features": [],
+        "emojis": [],
+        "stickers": [],
+        "threads": [],
+        "voice_states": [],
+        "roles": [
+            {
+                "id": str(guild_id + index),
+                "name": "@everyone" if index == 0 else f"Role {index}",
+                "permissions": "0",
+                "position": index,
+                "color": 0,
+                "hoist": False,
+                "managed": False,
+                "mentionable": False,
+            }
+            for index in range(roles + 1)
+        ],
+        "channels": [
+            {
+                "id": str(guild_id * 1_000 + index),
+                "type": 0,
+                "name": f"channel-{index}",
+                "position": index,
+                "permission_overwrites": [],
+            }
+            for index in range(channels)
+        ],
+        "members": member_payloads,
+        "presences": presence_payloads,
+    }
+
+
+def run_profile(profile: str, arguments: argparse.Namespace) -> Dict[str, Any]:
+    """Caches the synthetic guilds under the specified profile, and returns the measurements."""
+
+    # Same as `find_extensions` in `main.py`
+    extensions = sorted(
+        f"cogs.{module.name}"
+        for module in pkgutil.iter_modules(["src/cogs"])
+        if not module.ispkg
+    )
+    options = get_gateway_options(
+        {**get_config().gateway.to_dict(), "profile": profile}, extensions
+    )
+
+    # The client is never started, only its connection state is used
+    state = discord.Client(**options)._connection
+
+    gc.collect()
+    rss_before = get_rss()
+    elapsed = 0.0
+
+    for index in range(arguments.guilds):
+        # The payloads are built outside of the timing, and freed before the memory is measured
+        payload = build_guild_payload(
+            index + 1,
+            members=arguments.members,
+            channels=arguments.channels,
+            roles=arguments.roles,
+            intents=options["intents"],
+            chunked=options["chunk_guilds_at_startup"],
+        )
+
+        start = time.perf_counter()
+        state._add_guild_from_data(payload)
+        elapsed += time.perf_counter() - start
+
+        del payload
+
+    gc.collect()
+
+    return {
+        "profile": profile,
+        "intents": options["intents"].value,
+        "cached_members": sum(len(guild.members) for guild in state.guilds),
+        "rss_bytes": get_rss() - rss_before,
+        "seconds": elapsed,
+    }
+
+
+def main(arguments: argparse.Namespace) -> None:
+    results = []
+
+    # A fresh process for each profile, so the memory of one doesn't count towards the other
+    for profile in PROFILES:
+        output = subprocess.run(
+            [sys.executable, __file__, "--profile", profile, *sys.argv[1:]],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        results.append(json.loads(output.splitlines()[-1]))
+
+    print(
+        f"{arguments.guilds} guild(s) with {arguments.members} members, {arguments.channels} channels and {arguments.roles} roles each\n"
+    )
+    print(
+        f"{'Profile':<10} {'Intents':>10} {'Members cached':>15} {'RSS (MiB)':>10} {'Time (ms)':>10}"
+    )
+
+    for result in results:
+        print(
+            f"{result['profile']:<10} {result['intents']:>10} {result['cached_members']:>15} {result['rss_bytes'] / 2**20:>10.1f} {result['seconds'] * 1000:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--guilds", type=int, default=5, help="The number of guilds to cache"
+    )
+    parser.add_argument(
+        "--members", type=int, default=20000, help="The number of members per guild"
+    )
+    parser.add_argument(
+        "--channels", type=int, default=200, help="The number of channels per guild"
+    )
+    parser.add_argument(
+        "--roles", type=int, default=50, help="The number of roles per guild"
+    )
+    parser.add_argument("--profile", choices=PROFILES, help=argparse.SUPPRESS)
+    arguments = parser.parse_args()
+
+    # Only measures a single profile when run by `main`
+    if arguments.profile is not None:
+        print(json.dumps(run_profile(arguments.profile, arguments)))
+
+    else:
+        main(arguments)
@@ -1,12 +1,12 @@
 import logging
-from typing import Literal, Optional
+from typing import Dict, Literal, Optional
 
 import discord
 from discord import Interaction, Embed, Member, app_commands as app
 from discord.ext.commands import GroupCog, Bot
 
+from utils.about_store import about_store
 from utils.checks import is_valid_attachment_url
-from utils.db_handler import load_database_and_collection
 from utils.exc_manager import exception_manager
 from utils.msg_format import format_as_error_msg, format_as_success_msg
 from utils.modals.author_text_modal import AuthorTextModal
@@ -15,7 +15,6 @@ from utils.modals.title_modal import TitleModal
 from utils.modals.footer_text_modal import FooterTextModal
 
 logger = logging.getLogger("snapbot")
-coll = load_database_and_collection("about_data")
 
 Category = Literal[
     "Title",
@@ -30,6 +29,20 @@ Category = Literal[
     "Footer Icon",
 ]
 
+# Maps each category to the name of its field in the database
+CATEGORY_FIELDS: Dict[str, str] = {
+    "Title": "title",
+    "Description": "description",
+    "Color": "color",
+    "Image": "image",
+    "Thumbnail": "thumbnail",
+    "Author Text": "author_text",
+    "Author Icon": "author_icon",
+    "Author URL": "author_url",
+    "Footer Text": "footer_text",
+    "Footer Icon": "footer_icon",
+}
+
 
 class About(GroupCog, group_name="about"):
     def __init__(self, bot: Bot) -> None:
@@ -107,7 +120,8 @@ class About(GroupCog, group_name="about"):
         if user is None:
             user = interaction.user
 
-        about_data: Optional[dict] = await coll.find_one({"user_id": user.id})
+        # Served from the cache unless the user's about data changed since it was last viewed
+        about_data: Optional[dict] = await about_store.get(user.id)
 
         if about_data is None:
             await interaction.response.send_message(
@@ -118,7 +132,11 @@ class About(GroupCog, group_name="about"):
 
         await interaction.response.defer()
 
-        embed = self.generate_about_embed(data=about_data)
+        embed = about_store.get_embed(
+            user.id,
+            data=about_data,
+            builder=lambda data: self.generate_about_embed(data=data),
+        )
 
         # Checking if the embed is not empty
         try:
@@ -191,15 +209,9 @@ class About(GroupCog, group_name="about"):
             await interaction.followup.send(format_as_error_msg("Invalid Hex Code!"))
 
         else:
-            if await coll.find_one({"user_id": interaction.user.id}) is None:
-                await coll.insert_one(
-                    {"user_id": interaction.user.id, "color": f"#{color}"}
-                )
-
-            else:
-                await coll.update_one(
-                    {"user_id": interaction.user.id}, {"$set": {"color": f"#{color}"}}
-                )
+            await about_store.update(
+                interaction.user.id, set_fields={"color": f"#{color}"}
+            )
 
             await interaction.followup.send(
                 format_as_success_msg("Color successfully updated!")
@@ -224,13 +236,7 @@ class About(GroupCog, group_name="about"):
             The image attachment URL of the about embed.
         """
 
-        if await coll.find_one({"user_id": interaction.user.id}) is None:
-            await coll.insert_one({"user_id": interaction.user.id, "image": attachment})
-
-        else:
-            await coll.update_one(
-                {"user_id": interaction.user.id}, {"$set": {"image": attachment}}
-            )
+        await about_store.update(interaction.user.id, set_fields={"image": attachment})
 
         await interaction.response.send_message(
             format_as_success_msg("Image successfully updated!"), ephemeral=True
@@ -257,15 +263,9 @@ class About(GroupCog, group_name="about"):
             The thumbnail attachment URL of the about embed.
         """
 
-        if await coll.find_one({"user_id": interaction.user.id}) is None:
-            await coll.insert_one(
-                {"user_id": interaction.user.id, "thumbnail": attachment}
-            )
-
-        else:
-            await coll.update_one(
-                {"user_id": interaction.user.id}, {"$set": {"thumbnail": attachment}}
-            )
+        await about_store.update(
+            interaction.user.id, set_fields={"thumbnail": attachment}
+        )
 
         await interaction.response.send_message(
             format_as_success_msg("Thumbnail successfully updated!"), ephemeral=True
@@ -292,15 +292,9 @@ class About(GroupCog, group_name="about"):
             The author icon attachment URL of the about embed.
         """
 
-        if await coll.find_one({"user_id": interaction.user.id}) is None:
-            await coll.insert_one(
-                {"user_id": interaction.user.id, "author_icon": attachment}
-            )
-
-        else:
-            await coll.update_one(
-                {"user_id": interaction.user.id}, {"$set": {"author_icon": attachment}}
-            )
+        await about_store.update(
+            interaction.user.id, set_fields={"author_icon": attachment}
+        )
 
         await interaction.response.send_message(
             format_as_success_msg("Author Icon successfully updated!"), ephemeral=True
@@ -327,15 +321,9 @@ class About(GroupCog, group_name="about"):
             The footer icon attachment URL of the about embed.
         """
 
-        if await coll.find_one({"user_id": interaction.user.id}) is None:
-            await coll.insert_one(
-                {"user_id": interaction.user.id, "footer_icon": attachment}
-            )
-
-        else:
-            await coll.update_one(
-                {"user_id": interaction.user.id}, {"$set": {"footer_icon": attachment}}
-            )
+        await about_store.update(
+            interaction.user.id, set_fields={"footer_icon": attachment}
+        )
 
         await interaction.response.send_message(
             format_as_success_msg("Footer Icon successfully updated!"), ephemeral=True
@@ -359,13 +347,7 @@ class About(GroupCog, group_name="about"):
             The author url of the about embed.
         """
 
-        if await coll.find_one({"user_id": interaction.user.id}) is None:
-            await coll.insert_one({"user_id": interaction.user.id, "author_url": url})
-
-        else:
-            await coll.update_one(
-                {"user_id": interaction.user.id}, {"$set": {"author_url": url}}
-            )
+        await about_store.update(interaction.user.id, set_fields={"author_url": url})
 
         await interaction.response.send_message(
             format_as_success_msg("Author URL successfully updated!"), ephemeral=True
@@ -419,7 +401,12 @@ class About(GroupCog, group_name="about"):
             The category to reset.
         """
 
-        if await coll.find_one({"user_id": interaction.user.id}) is None:
+        # A single update, which doesn't create the about data if it doesn't exist yet
+        result = await about_store.update(
+            interaction.user.id, unset_fields=[CATEGORY_FIELDS[category]], upsert=False
+        )
+
+        if result.matched_count == 0:
             await interaction.response.send_message(
                 format_as_error_msg(
                     "You can't reset something which doesn't even exist dumbo!"
@@ -428,56 +415,6 @@ class About(GroupCog, group_name="about"):
             )
             return
 
-        if category == "Title":
-            await coll.update_one(
-                {"user_id": interaction.user.id}, {"$unset": {"title": ""}}
-            )
-
-        elif category == "Description":
-            await coll.update_one(
-                {"user_id": interaction.user.id}, {"$unset": {"description": ""}}
-            )
-
-        elif category == "Color":
-            await coll.update_one(
-                {"user_id": interaction.user.id}, {"$unset": {"color": ""}}
-            )
-
-        elif category == "Image":
-            await coll.update_one(
-                {"user_id": interaction.user.id}, {"$unset": {"image": ""}}
-            )
-
-        elif category == "Thumbnail":
-            await coll.update_one(
-                {"user_id": interaction.user.id}, {"$unset": {"thumbnail": ""}}
-            )
-
-        elif category == "Author Text":
-            await coll.update_one(
-                {"user_id": interaction.user.id}, {"$unset": {"author_text": ""}}
-            )
-
-        elif category == "Author URL":
-            await coll.update_one(
-                {"user_id": interaction.user.id}, {"$unset": {"author_url": ""}}
-            )
-
-        elif category == "Author Icon":
-            await coll.update_one(
-                {"user_id": interaction.user.id}, {"$unset": {"author_icon": ""}}
-            )
-
-        elif category == "Footer Text":
-            await coll.update_one(
-                {"user_id": interaction.user.id}, {"$unset": {"footer_text": ""}}
-            )
-
-        else:
-            await coll.update_one(
-                {"user_id": interaction.user.id}, {"$unset": {"footer_icon": ""}}
-            )
-
         await interaction.response.send_message(
             format_as_success_msg(f"{category} successfully removed!"), ephemeral=True
         )
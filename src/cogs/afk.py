@@ -1,22 +1,47 @@
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional
 
 import discord
-from discord import Interaction, Embed, Member, app_commands as app
+from discord import (
+    Interaction,
+    Embed,
+    Member,
+    RawMemberRemoveEvent,
+    app_commands as app,
+)
+from discord.ext import tasks
 from discord.ext.commands import Cog, Bot
+from pymongo.errors import PyMongoError
 
-from utils.db_handler import load_database_and_collection
+from utils.afk_store import afk_store
+from utils.cfg_handler import get_config
 from utils.exc_manager import exception_manager
+from utils.msg_format import format_as_error_msg
+from utils.nickname_queue import nickname_queue
 
 logger = logging.getLogger("snapbot")
-coll = load_database_and_collection("afk_data")
+
+# The gateway intents this cog needs. The members of a guild are needed to edit their nicknames
+INTENTS = ("members",)
 
 
 class AFK(Cog):
     def __init__(self, bot: Bot) -> None:
         self.bot = bot
 
+    async def cog_load(self) -> None:
+        self.sweep_expired.change_interval(
+            seconds=get_config().features.afk.sweep_interval
+        )
+        self.sweep_expired.start()
+
+    async def cog_unload(self) -> None:
+        self.sweep_expired.cancel()
+
+        # Gives the queued nickname edits a chance to finish before the bot disconnects
+        await nickname_queue.close()
+
     async def cog_app_command_error(
         self, interaction: Interaction, error: app.AppCommandError
     ) -> None:
@@ -71,14 +96,83 @@ class AFK(Cog):
 
         return f"Welcome back {user.mention}!\nYou went AFK at {timestamp}\n\n**Reason**: {reason}"
 
+    async def restore_nickname(self, afk_data: dict) -> None:
+        """Restores the nickname a user had before going AFK, in the guild they went AFK in. The nickname is left alone if the user changed it in the meantime, or if they left the guild.
+
+        Parameters
+        ----------
+        afk_data : `dict`
+            The user's AFK record.
+        """
+
+        # Records from before the guild was stored can't be traced back to a guild
+        guild = self.bot.get_guild(afk_data.get("guild_id"))
+
+        if guild is None:
+            return
+
+        user_id: int = afk_data["user_id"]
+
+        try:
+            member = guild.get_member(user_id) or await guild.fetch_member(user_id)
+
+        except discord.NotFound:
+            return
+
+        except discord.HTTPException as error:
+            logger.error(f"Couldn't fetch the member {user_id}: {error}")
+            return
+
+        if member.nick is not None and member.nick.startswith("[AFK]"):
+            nickname_queue.enqueue(member, afk_data["nickname"])
+
+    @tasks.loop(seconds=60)
+    async def sweep_expired(self) -> None:
+        """Removes the AFK status of a batch of users whose AFK status has expired, and queues the restoration of their nicknames."""
+
+        config = get_config().features.afk
+        expired = afk_store.get_expired(datetime.now(), limit=config.sweep_batch_size)
+
+        if not expired:
+            return
+
+        try:
+            removed = await afk_store.pop_many(data["user_id"] for data in expired)
+
+        # The records are put back in memory, so the next sweep tries again
+        except PyMongoError as error:
+            logger.error(f"Couldn't remove the expired AFK records: {error}")
+            return
+
+        for afk_data in removed:
+            await self.restore_nickname(afk_data)
+
+        logger.info(f"Expired the AFK status of {len(removed)} user(s)")
+
+    @sweep_expired.before_loop
+    async def before_sweep_expired(self) -> None:
+        await self.bot.wait_until_ready()
+
+    @Cog.listener()
+    async def on_raw_member_remove(self, payload: RawMemberRemoveEvent) -> None:
+        afk_data = afk_store.get(payload.user.id)
+
+        # Users who leave the guild they went AFK in won't come back to reset their status
+        if afk_data is not None and afk_data.get("guild_id") == payload.guild_id:
+            await afk_store.pop(payload.user.id)
+
     @app.command(name="afk", description="Sets your status to AFK in the server.")
-    @app.describe(reason="Why are you going AFK?")
+    @app.describe(
+        reason="Why are you going AFK?",
+        hours="After how many hours should your AFK status expire?",
+    )
     @app.checks.cooldown(1, 10)
     @app.guild_only()
     async def afk(
         self,
         interaction: Interaction,
         reason: app.Range[str, None, 200] = "Not Provided",
+        hours: Optional[app.Range[int, 1, 720]] = None,
     ) -> None:
         """A command which allows users to set their status to AFK in the server. The bot will basically remind any user who pings/mentions an AFK user in the server to let them know that the person they are trying to contact is AFK.
 
@@ -89,50 +183,82 @@ class AFK(Cog):
 
         reason : `Optional[app.Range[str, None, 200]]`
             Represents the reason why user is going AFK. Defaults to `Not provided` if not set and can only be upto 200 characters max.
+
+        hours : `Optional[app.Range[int, 1, 720]]`
+            The number of hours after which the AFK status expires. Defaults to the `default_expiry_hours` set in `config.json`, where `null` means it never expires.
         """
 
         await interaction.response.defer()
         user = interaction.user
 
-        # Fetching data from the database
-        afk_data: Optional[dict] = await coll.find_one({"user_id": user.id})
+        # Fetching data from the in-memory AFK index
+        afk_data: Optional[dict] = afk_store.get(user.id)
 
         # If the fetched data is None, it means the user wasn't afk before using this command
         # Basically, we have to set the status to AFK in this case
         if afk_data is None:
-            await coll.insert_one(
-                {
-                    "user_id": user.id,  # User's ID
-                    "reason": reason,  # Reason
-                    "timestamp": datetime.now(),  # Datetime object
-                    "nickname": user.nick,  # User's nickname
-                }
-            )
-            embed = self.generate_afk_embed(user=user, reason=reason)
+            if hours is None:
+                hours = get_config().features.afk.default_expiry_hours
+
+            timestamp = datetime.now()
 
             try:
-                await user.edit(nick=f"[AFK] {user.display_name}")
+                await afk_store.add(
+                    {
+                        "user_id": user.id,  # User's ID
+                        "guild_id": interaction.guild_id,  # ID of the guild the nickname is changed in
+                        "reason": reason,  # Reason
+                        "timestamp": timestamp,  # Datetime object
+                        "expires_at": (
+                            None
+                            if hours is None
+                            else timestamp + timedelta(hours=hours)
+                        ),  # When the AFK status is removed automatically
+                        "nickname": user.nick,  # User's nickname
+                    }
+                )
+
+            # The interaction is already deferred, so the error is answered here instead of by the exception manager
+            except PyMongoError as error:
+                logger.error(
+                    f"Couldn't set the AFK status of the user {user.id}: {error}"
+                )
+                await interaction.followup.send(
+                    format_as_error_msg(
+                        "Your AFK status couldn't be set. Please try again later!"
+                    ),
+                    ephemeral=True,
+                )
+                return
 
-            except discord.Forbidden:
-                logger.error(f"Couldn't change the nickname of the user {user.id}")
+            embed = self.generate_afk_embed(user=user, reason=reason)
 
-            finally:
-                await interaction.followup.send(embed=embed)
+            # The nickname is changed in the background, so the reply doesn't wait for it
+            nickname_queue.enqueue(user, f"[AFK] {user.display_name}")
+            await interaction.followup.send(embed=embed)
 
         # If the fetched data is not None, it means the user was afk before using this command
         # So, we can just remove the afk status here in this case
         else:
-            await coll.delete_one({"user_id": user.id})
             try:
-                await user.edit(nick=afk_data["nickname"])
-
-            except discord.Forbidden:
-                logger.error(f"Couldn't reset the nickname of the user {user.id}")
+                await afk_store.pop(user.id)
 
-            finally:
+            except PyMongoError as error:
+                logger.error(
+                    f"Couldn't remove the AFK status of the user {user.id}: {error}"
+                )
                 await interaction.followup.send(
-                    self.generate_welcome_back_msg(data=afk_data)
+                    format_as_error_msg(
+                        "Your AFK status couldn't be removed. Please try again later!"
+                    ),
+                    ephemeral=True,
                 )
+                return
+
+            nickname_queue.enqueue(user, afk_data["nickname"])
+            await interaction.followup.send(
+                self.generate_welcome_back_msg(data=afk_data)
+            )
 
 
 async def setup(bot: Bot) -> None:
@@ -5,7 +5,6 @@ from typing import List, Literal, Optional, Union
 import discord
 from discord import Interaction, Embed, Member, User, ButtonStyle, app_commands as app
 from discord.ext.commands import Cog, Bot
-from reactionmenu import ViewMenu, ViewButton
 
 from utils.exc_manager import exception_manager
 
@@ -128,6 +127,9 @@ class Avatar(Cog):
                 )
             )
 
+        # Imported on first use, so that it doesn't slow down the bot's startup
+        from reactionmenu import ViewMenu, ViewButton
+
         view_menu = ViewMenu(interaction, menu_type=ViewMenu.TypeEmbed)
         # Adding embeds list as pages to the view menu
         view_menu.add_pages(embeds)
@@ -1,26 +1,47 @@
+import asyncio
 import logging
 from datetime import datetime
-from typing import Literal, Optional
+from typing import Literal, Optional, Tuple
 
 import discord
 from discord import Interaction, Embed, app_commands as app
 from discord.ext.commands import GroupCog, Bot
+from pymongo.errors import PyMongoError
 
+from utils.cfg_handler import get_config
 from utils.checks import is_valid_attachment_url, is_owner
+from utils.confession_ledger import confession_ledger
 from utils.errors import NotValidURL, NotOwner
 from utils.exc_manager import exception_manager
 from utils.helpers import get_channel
-from utils.encryption import encrypt, decrypt
+from utils.encryption import (
+    async_decrypt,
+    async_encrypt,
+    async_shutdown_executor,
+)
+from utils.metrics import Histogram
+from utils.paginator import CursorPaginator
 from utils.msg_format import format_as_error_msg, format_as_success_msg
 
 logger = logging.getLogger("snapbot")
 
+POST_LATENCY = Histogram(
+    "confession_post_seconds",
+    "Time taken by /confession post, from receiving the command to confirming the post",
+)
+
+# The number of confessions listed on each page of /confession logs
+LOGS_PAGE_SIZE = 10
+
 
 @app.guild_only()
 class Confession(GroupCog, group_name="confession"):
     def __init__(self, bot: Bot) -> None:
         self.bot = bot
-        self.encrypted_user_id = None
+
+    async def cog_unload(self) -> None:
+        # Lets any pending encryption work finish before the thread pool goes away, without blocking the event loop
+        await async_shutdown_executor()
 
     async def cog_app_command_error(
         self, interaction: Interaction, error: app.AppCommandError
@@ -34,6 +55,8 @@ class Confession(GroupCog, group_name="confession"):
         confession: str,
         attachment: Optional[str],
         type: Literal["Log", "Confession"],
+        encrypted_user_id: Optional[str] = None,
+        confession_id: Optional[int] = None,
     ) -> Embed:
         """Generates a discord embed which can be used to display the info about the confession to the confessions channel anonymously or to the log channel where it shows the encrypted user Id of the user who made that confession.
 
@@ -48,6 +71,12 @@ class Confession(GroupCog, group_name="confession"):
         type : `Literal["Log", "Confession"]`
             The type of embed to generate. `Log` generates a log embed displaying the confession log and `Confession` generates the actual confession embed.
 
+        encrypted_user_id : `Optional[str]`
+            The encrypted user ID of the user who made the confession. Only displayed in the `Log` embed. Defaults to `None`.
+
+        confession_id : `Optional[int]`
+            The confession's ID in the ledger. Defaults to `None`.
+
         Returns
         -------
         `discord.Embed`
@@ -62,16 +91,30 @@ class Confession(GroupCog, group_name="confession"):
         embed.set_image(url=attachment)
 
         if type == "Confession":
-            embed.set_author(name="Anonymous Confession!")
+            embed.set_author(name=f"Anonymous Confession #{confession_id}!")
             return embed
 
         else:
             embed.title = "Confession Log"
-            embed.add_field(
-                name="Encrypted Key", value=self.encrypted_user_id, inline=False
-            )
+            embed.add_field(name="Confession ID", value=confession_id, inline=False)
+            embed.add_field(name="Encrypted Key", value=encrypted_user_id, inline=False)
             return embed
 
+    async def delete_message(self, message: discord.Message) -> None:
+        """Deletes a message sent by the bot, logging an error if it can't be deleted.
+
+        Parameters
+        ----------
+        message : `discord.Message`
+            The message to delete.
+        """
+
+        try:
+            await message.delete()
+
+        except discord.HTTPException as error:
+            logger.error(f"Couldn't delete the message {message.id}: {error}")
+
     @app.command(name="post", description="Post an anonymous confession in the server!")
     @app.describe(
         confession="What are you confessing?",
@@ -99,50 +142,161 @@ class Confession(GroupCog, group_name="confession"):
             The attachment's url if the user wishes to attach something with the confession text. Defaults to `None` if user skips this option.
         """
 
-        await interaction.response.defer(ephemeral=True)
+        # Measures the time taken from receiving the command to confirming the post
+        with POST_LATENCY.time():
+            await interaction.response.defer(ephemeral=True)
 
-        # Encrypt the command invoker's user ID
-        self.encrypted_user_id = encrypt(str(interaction.user.id))
+            # Get the required channels, as set in the server's settings
+            log_channel = get_channel(interaction, channel="log")
+            confession_channel = get_channel(interaction, channel="confession")
 
-        # Get the required channels
-        log_channel = get_channel(interaction, channel="log")
-        confession_channel = get_channel(interaction, channel="confession")
+            if log_channel is None or confession_channel is None:
+                await interaction.followup.send(
+                    format_as_error_msg(
+                        "Confessions haven't been set up in this server yet! Ask a server manager to set the channels using ``/settings channel``."
+                    )
+                )
+                return
 
-        # Send the embeds to their respective channels
-        await log_channel.send(
-            embed=self.generate_embed(
-                confession=confession, attachment=attachment, type="Log"
-            )
-        )
-        await confession_channel.send(
-            embed=self.generate_embed(
-                confession=confession, attachment=attachment, type="Confession"
+            # Encrypt the command invoker's user ID in a background thread while reserving the confession's ID in the ledger. Both are kept local to this confession, so that concurrent confessions can't mix them up
+            try:
+                encrypted_user_id, confession_id = await asyncio.gather(
+                    async_encrypt(str(interaction.user.id)),
+                    confession_ledger.next_id(),
+                )
+
+            # The interaction is already deferred, so the error is answered here instead of by the exception manager
+            except PyMongoError as error:
+                logger.error(f"Couldn't reserve a confession ID in the ledger: {error}")
+                await interaction.followup.send(
+                    format_as_error_msg(
+                        "Your confession couldn't be posted. Please try again later!"
+                    )
+                )
+                return
+
+            # Send the embeds to their respective channels at the same time
+            log_message, confession_message = await asyncio.gather(
+                log_channel.send(
+                    embed=self.generate_embed(
+                        confession=confession,
+                        attachment=attachment,
+                        type="Log",
+                        encrypted_user_id=encrypted_user_id,
+                        confession_id=confession_id,
+                    )
+                ),
+                confession_channel.send(
+                    embed=self.generate_embed(
+                        confession=confession,
+                        attachment=attachment,
+                        type="Confession",
+                        confession_id=confession_id,
+                    )
+                ),
+                return_exceptions=True,
             )
-        )
 
-        await interaction.followup.send(
-            format_as_success_msg(
-                f"Your confession has been successfully posted in {confession_channel.mention}!"
+            # A confession is either posted along with its log, or not posted at all
+            if isinstance(log_message, BaseException) or isinstance(
+                confession_message, BaseException
+            ):
+                for message, channel in (
+                    (log_message, log_channel),
+                    (confession_message, confession_channel),
+                ):
+                    if isinstance(message, BaseException):
+                        logger.error(
+                            f"Couldn't send the confession to the channel {channel.id}: {message}"
+                        )
+
+                    else:
+                        await self.delete_message(message)
+
+                await interaction.followup.send(
+                    format_as_error_msg(
+                        "Your confession couldn't be posted. Please try again later!"
+                    )
+                )
+                return
+
+            # The log message still holds the encrypted key, so the confession stays traceable even if it can't be stored in the ledger
+            try:
+                await confession_ledger.add(
+                    confession_id,
+                    guild_id=interaction.guild_id,
+                    ciphertext=encrypted_user_id,
+                    log_message_id=log_message.id,
+                    confession_message_id=confession_message.id,
+                )
+
+            except PyMongoError as error:
+                logger.error(
+                    f"Couldn't store the confession #{confession_id} in the ledger: {error}"
+                )
+
+            await interaction.followup.send(
+                format_as_success_msg(
+                    f"Your confession has been successfully posted in {confession_channel.mention}!"
+                )
             )
-        )
 
     @app.command(
-        name="decrypt", description="Decrypts the confession using the encryption key"
+        name="decrypt",
+        description="Decrypts the confession using its ID or encryption key",
     )
-    @app.describe(encrypted_key="Enter the encrypted key for decryption.")
+    @app.describe(key="Enter the confession ID or the encrypted key for decryption.")
     @is_owner()
-    async def decrypt(self, interaction: Interaction, encrypted_key: str) -> None:
-        decrypted_message = decrypt(encrypted_key)
+    async def decrypt(self, interaction: Interaction, key: str) -> None:
+        # Deferred first, since looking up the ledger and decrypting can take longer than Discord waits for a response
+        await interaction.response.defer(ephemeral=True)
+
+        encrypted_key = key
+
+        # Short numeric keys are confession IDs, which are looked up in the guild's ledger
+        if key.isdigit():
+            try:
+                confession = await confession_ledger.get(
+                    int(key), guild_id=interaction.guild_id
+                )
+
+            except PyMongoError as error:
+                logger.error(f"Couldn't look up the confession #{key}: {error}")
+                await interaction.followup.send(
+                    format_as_error_msg(
+                        "The confession couldn't be looked up. Please try again later!"
+                    )
+                )
+                return
+
+            if confession is None:
+                await interaction.followup.send(
+                    format_as_error_msg(
+                        f"No confession with the ID ``{key}`` was found!"
+                    )
+                )
+                return
+
+            encrypted_key = confession["ciphertext"]
+
+        # Raw keys aren't tied to any guild and every guild shares the same encryption key, so only the bot owner may decrypt them. Owners set in a guild's settings are limited to the confessions in their guild's ledger
+        elif interaction.user.id != get_config().bot.owner:
+            await interaction.followup.send(
+                format_as_error_msg(
+                    "Only the bot owner can decrypt encrypted keys! Use the confession's ID instead."
+                )
+            )
+            return
+
+        decrypted_message = await async_decrypt(encrypted_key)
 
         # If the decryption fails
         if decrypted_message is None:
-            await interaction.response.send_message(
-                format_as_error_msg("Invalid Encryption Key!"), ephemeral=True
+            await interaction.followup.send(
+                format_as_error_msg("Invalid Encryption Key!")
             )
             return
 
-        await interaction.response.defer(ephemeral=True)
-
         # Get the log channel
         log_channel = get_channel(interaction, channel="log")
 
@@ -154,6 +308,74 @@ class Confession(GroupCog, group_name="confession"):
             f"Encryption Successful!\n\n**User ID**: {decrypted_message}"
         )
 
+    async def fetch_logs_page(
+        self, interaction: Interaction, /, *, before: Optional[int]
+    ) -> Tuple[Embed, Optional[int]]:
+        """Fetches a page of the guild's confession ledger, newest first.
+
+        Parameters
+        ----------
+        interaction : `discord.Interaction`
+            Represents a Discord Interaction
+
+        before : `Optional[int]`
+            Only confessions with an ID lower than this are listed. `None` for the first page.
+
+        Returns
+        -------
+        `Tuple[Embed, Optional[int]]`
+            The page's embed, and the cursor of the next page. The cursor is `None` if this is the last page.
+        """
+
+        # One extra confession is fetched to find out whether there is a next page
+        confessions = await confession_ledger.page(
+            guild_id=interaction.guild_id, before=before, limit=LOGS_PAGE_SIZE + 1
+        )
+        has_next_page = len(confessions) > LOGS_PAGE_SIZE
+        confessions = confessions[:LOGS_PAGE_SIZE]
+
+        embed = discord.Embed(
+            title="Confession Logs",
+            color=discord.Color.blurple(),
+            timestamp=datetime.now(),
+        )
+
+        if not confessions:
+            embed.description = "No confessions have been posted in this server yet."
+
+        for confession in confessions:
+            embed.add_field(
+                name=f"Confession #{confession['confession_id']}",
+                value=f"Posted {discord.utils.format_dt(confession['timestamp'], 'R')}\nLog Message ID: ``{confession['log_message_id']}``",
+                inline=False,
+            )
+
+        embed.set_footer(
+            text="Use /confession decrypt with a confession's ID to decrypt it"
+        )
+
+        next_cursor = confessions[-1]["confession_id"] if has_next_page else None
+        return embed, next_cursor
+
+    @app.command(name="logs", description="Lists the confessions posted in the server")
+    @is_owner()
+    async def logs(self, interaction: Interaction) -> None:
+        """A command which allows the owner to browse the confession ledger of the server, newest first.
+
+        Parameters
+        ----------
+        interaction : `Interaction`
+            Represents a Discord Interaction
+        """
+
+        await interaction.response.defer(ephemeral=True)
+
+        paginator = CursorPaginator(
+            interaction,
+            fetch_page=lambda cursor: self.fetch_logs_page(interaction, before=cursor),
+        )
+        await paginator.start(ephemeral=True)
+
 
 async def setup(bot: Bot) -> None:
     await bot.add_cog(Confession(bot))
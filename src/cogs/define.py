@@ -1,15 +1,16 @@
 import logging
 from datetime import datetime
-from typing import Generator, List
+from typing import List, Optional
 
 import discord
-from discord import Interaction, Embed, ButtonStyle, app_commands as app
+from discord import Interaction, Embed, app_commands as app
 from discord.ext.commands import Cog, Bot
-from reactionmenu import ViewMenu, ViewButton, ViewSelect
-import requests
 
+from utils.cache import TTLCache
+from utils.cfg_handler import get_config
 from utils.exc_manager import exception_manager
 from utils.msg_format import format_as_error_msg
+from utils.paginator import LazyPaginator
 
 logger = logging.getLogger("snapbot")
 
@@ -18,16 +19,19 @@ class Define(Cog):
     def __init__(self, bot: Bot) -> None:
         self.bot = bot
 
+        # Caches the definitions list of recently queried words
+        self.cache = TTLCache(**get_config().cache.define, name="define")
+
     async def cog_app_command_error(
         self, interaction: Interaction, error: app.AppCommandError
     ) -> None:
         logger.error(error)
         await exception_manager(interaction, error)
 
-    def generate_definition_embeds(
-        self, interaction: Interaction, /, *, word: str, data_list: List[dict]
-    ) -> Generator[discord.Embed, None, None]:
-        """Generates varying amount of discord embeds where each embed display information fetched from the Urban Dictionary which is specified in the form of a list( `data_list` ) for the specified word.
+    def generate_definition_embed(
+        self, interaction: Interaction, /, *, word: str, data: dict
+    ) -> Embed:
+        """Generates a discord embed which displays a single definition fetched from the Urban Dictionary for the specified word.
 
         Parameters
         ----------
@@ -37,33 +41,61 @@ class Define(Cog):
         word : `str`
             The word which was queried in the Urban Dictionary.
 
-        data_list : `List[dict]`
-            The data fetched from the Urban dictionary.
+        data : `dict`
+            The definition data fetched from the Urban dictionary.
 
-        Yields
-        ------
-        `Generator[discord.Embed, None, None]`
+        Returns
+        -------
+        `Embed`
         """
 
-        for data in data_list:
-            definition: str = data["definition"]
-            example: str = data["example"]
-            author: str = data["author"]
+        definition: str = data["definition"]
+        example: str = data["example"]
+        author: str = data["author"]
 
-            embed = (
-                Embed(
-                    description=f"**{word}**: {definition}\n\n**Example**: {example}",
-                    color=discord.Colour.random(),
-                    timestamp=datetime.now(),
-                )
-                .set_author(
-                    name=f"Requested By {interaction.user.display_name}",
-                    icon_url=interaction.user.display_avatar.url,
-                )
-                .set_footer(text=f"Written by {author}")
+        return (
+            Embed(
+                description=f"**{word}**: {definition}\n\n**Example**: {example}",
+                color=discord.Colour.random(),
+                timestamp=datetime.now(),
             )
+            .set_author(
+                name=f"Requested By {interaction.user.display_name}",
+                icon_url=interaction.user.display_avatar.url,
+            )
+            .set_footer(text=f"Written by {author}")
+        )
+
+    async def fetch_definitions(self, word: str) -> Optional[List[dict]]:
+        """Returns the list of definitions for the specified word from the Urban Dictionary. Returns `None` if the API couldn't be reached.
+
+        Results are cached, and concurrent lookups for the same word share a single request.
+
+        Parameters
+        ----------
+        word : `str`
+            The word to query in the Urban Dictionary.
+
+        Returns
+        -------
+        `Optional[List[dict]]`
+        """
+
+        # Words are looked up case-insensitively, so they share the same cache entry
+        term = " ".join(word.lower().split())
+
+        async def fetch() -> Optional[List[dict]]:
+            # Make a non-blocking http request to Urban Dictionary through the bot's shared web client
+            response_in_json: Optional[dict] = await self.bot.web_client.get_json(
+                "https://api.urbandictionary.com/v0/define", params={"term": term}
+            )
+
+            if response_in_json is None:
+                return None
 
-            yield embed
+            return response_in_json.get("list", [])
+
+        return await self.cache.get_or_fetch(term, fetch)
 
     @app.command(
         name="define",
@@ -84,84 +116,37 @@ class Define(Cog):
             The word provided by the user which will be searched in the Urban Dictionary.
         """
 
-        # URL for making http request to Urban Dictionary
-        url = f"https://api.urbandictionary.com/v0/define?term={word}"
+        # Defer first, as the Urban Dictionary API may take longer to answer than Discord allows for an initial response
+        await interaction.response.defer()
 
-        # Get the response using the URL and run requirement checks like the status code or if the response is empty
-        response = requests.get(url)
+        # Get the data list for the word and run requirement checks like if the API is down or if the list is empty
+        data: Optional[List[dict]] = await self.fetch_definitions(word)
 
-        if response.status_code != 200:
-            await interaction.response.send_message(
+        if data is None:
+            await interaction.followup.send(
                 format_as_error_msg(
                     "Urban Dictionary API is down! Please try again later."
-                ),
-                ephemeral=True,
+                )
             )
             return
 
-        response_in_json: dict = response.json()
-
-        if not response_in_json["list"]:
-            await interaction.response.send_message(
-                format_as_error_msg(f"No definitions found for the word: **{word}**"),
-                ephemeral=True,
+        if not data:
+            await interaction.followup.send(
+                format_as_error_msg(f"No definitions found for the word: **{word}**")
             )
             return
 
-        await interaction.response.defer()
-
-        # Get the data list from the response
-        data: List[dict] = response_in_json["list"]
-
-        embeds: list[discord.Embed] = []
-
-        # Adding all the embeds generated from the function to the embeds list defined earlier
-        for embed in self.generate_definition_embeds(
-            interaction, word=word, data_list=data
-        ):
-            embeds.append(embed)
-
-        # Create a view menu of type Embed
-        view_menu = ViewMenu(interaction, menu_type=ViewMenu.TypeEmbed)
-
-        # Defining buttons and select for the view menu
-        next_button = ViewButton(
-            style=ButtonStyle.secondary,
-            label="Next",
-            custom_id=ViewButton.ID_NEXT_PAGE,
-            emoji="➡️",
-        )
-        previous_button = ViewButton(
-            style=ButtonStyle.secondary,
-            label="Previous",
-            custom_id=ViewButton.ID_PREVIOUS_PAGE,
-            emoji="⬅️",
-        )
-        go_to_first_button = ViewButton(
-            style=ButtonStyle.secondary,
-            label="Go to First",
-            custom_id=ViewButton.ID_GO_TO_FIRST_PAGE,
-            emoji="⏮️",
-        )
-        go_to_last_button = ViewButton(
-            style=ButtonStyle.secondary,
-            label="Go to Last",
-            custom_id=ViewButton.ID_GO_TO_LAST_PAGE,
-            emoji="⏭️",
-        )
-        go_to = ViewSelect.GoTo(title="Navigate to page...", page_numbers=...)
-
-        # Add embeds list as pages to the view menu
-        view_menu.add_pages(embeds)
-
-        # Adding buttons and select to the view menu
-        view_menu.add_buttons(
-            [go_to_first_button, previous_button, next_button, go_to_last_button]
+        # Each page's embed is only built when the user navigates to it( or next to it )
+        paginator = LazyPaginator(
+            interaction,
+            page_count=len(data),
+            page_builder=lambda index: self.generate_definition_embed(
+                interaction, word=word, data=data[index]
+            ),
         )
-        view_menu.add_go_to_select(go_to)
 
-        # Starting the view menu
-        await view_menu.start()
+        # Starting the paginator
+        await paginator.start()
 
 
 async def setup(bot: Bot) -> None:
@@ -1,22 +1,83 @@
 import logging
+import time
 from datetime import datetime
-from typing import Literal, Optional
+from typing import Callable, FrozenSet, List, Literal, Optional, Tuple
 
 import discord
 from discord import Interaction, Embed, Member, Message, app_commands as app
+from discord.abc import GuildChannel
 from discord.ext.commands import Cog, Bot
 
-from utils.db_handler import load_database_and_collection
+from utils.afk_store import afk_store
+from utils.cfg_handler import ConfigSection, get_config
+from utils.channel_resolver import channel_resolver
 from utils.exc_manager import exception_manager
+from utils.metrics import Counter, Histogram
+from utils.nickname_queue import nickname_queue
 
 logger = logging.getLogger("snapbot")
-coll = load_database_and_collection("afk_data")
+
+# The gateway intents this cog needs. Messages are read for AFK users and their mentions, and the prefix commands need the message content
+INTENTS = ("guild_messages", "message_content")
+
+MESSAGES_FILTERED = Counter(
+    "messages_filtered_total",
+    "Number of messages dropped by each of the message filters",
+    labels=("filter",),
+)
+MESSAGE_LATENCY = Histogram(
+    "message_handling_seconds",
+    "Time taken by on_message to handle the messages which weren't dropped by the filters",
+)
+
+# The AFK feature's configuration section, along with the guilds it disables the feature in. Rebuilt once the configuration is reloaded
+_disabled_guilds: Tuple[Optional[ConfigSection], FrozenSet[int]] = (None, frozenset())
+
+
+def get_disabled_guilds() -> FrozenSet[int]:
+    """Returns the IDs of the guilds the AFK feature is disabled in, as set in `config.json`. The set is only rebuilt when the configuration has been reloaded.
+
+    Returns
+    -------
+    `FrozenSet[int]`
+    """
+
+    global _disabled_guilds
+
+    afk_config: ConfigSection = get_config().features.afk
+
+    # Every reload creates new sections, so an unchanged identity means the cached set is still valid
+    if _disabled_guilds[0] is not afk_config:
+        _disabled_guilds = (afk_config, frozenset(afk_config.disabled_guilds))
+
+    return _disabled_guilds[1]
+
+
+# Ordered, cheap checks which only use local state. A message is dropped by the first check that returns `True`, before any I/O is done for it
+MESSAGE_FILTERS: List[Tuple[str, Callable[[Message], bool]]] = [
+    ("bot_author", lambda message: message.author.bot),
+    ("webhook", lambda message: message.webhook_id is not None),
+    ("direct_message", lambda message: message.guild is None),
+    (
+        "feature_disabled",
+        lambda message: message.guild.id in get_disabled_guilds(),
+    ),
+    (
+        "no_afk_user",
+        lambda message: message.author.id not in afk_store
+        and not any(user.id in afk_store for user in message.mentions),
+    ),
+]
 
 
 class Events(Cog):
     def __init__(self, bot: Bot) -> None:
         self.bot = bot
 
+    async def cog_load(self) -> None:
+        # Warm the in-memory AFK index so that message checks don't have to query the database
+        await afk_store.load()
+
     async def cog_app_command_error(
         self, interaction: Interaction, error: app.AppCommandError
     ) -> None:
@@ -53,6 +114,34 @@ class Events(Cog):
         else:
             return f"{user.display_name} went AFK {timestamp_relative_datetime}\n\n**Reason**: {reason}"
 
+    def join_replies(self, replies: List[str], *, limit: int = 2000) -> List[str]:
+        """Joins multiple reply messages into as few messages as possible, keeping each one within Discord's character limit.
+
+        Parameters
+        ----------
+        replies : `List[str]`
+            The reply messages to join.
+
+        limit : `int`
+            The maximum number of characters in a single message. Defaults to `2000`.
+
+        Returns
+        -------
+        `List[str]`
+        """
+
+        separator = "\n\n"
+        messages: List[str] = []
+
+        for reply in replies:
+            if messages and len(messages[-1]) + len(separator) + len(reply) <= limit:
+                messages[-1] += separator + reply
+
+            else:
+                messages.append(reply[:limit])
+
+        return messages
+
     async def check_for_afk_user(self, message: Message) -> None:
         """A helper function which checks for afk users in every message. If a message is from a user who was AFK, this function will greet them with a welcome back response.
 
@@ -62,23 +151,19 @@ class Events(Cog):
             The message sent in the server.
         """
 
-        afk_data: Optional[dict] = await coll.find_one({"user_id": message.author.id})
-
-        if afk_data is not None:
-            await coll.delete_one({"user_id": message.author.id})
-
-            try:
-                await message.author.edit(nick=afk_data["nickname"])
+        # Most authors aren't AFK, so check the in-memory index before doing any I/O
+        if afk_store.get(message.author.id) is None:
+            return
 
-            except discord.Forbidden:
-                logger.error(
-                    f"Couldn't reset the nickname of the user {message.author.id}"
-                )
+        afk_data: Optional[dict] = await afk_store.pop(message.author.id)
 
-            finally:
-                await message.reply(
-                    self.generate_reply_message(data=afk_data, type="Welcome")
-                )
+        # Another message from the same author may have already removed the record
+        if afk_data is not None:
+            # The nickname is reset in the background, so the welcome back reply goes out straight away
+            nickname_queue.enqueue(message.author, afk_data["nickname"])
+            await message.reply(
+                self.generate_reply_message(data=afk_data, type="Welcome")
+            )
 
     async def check_for_afk_user_pings(self, message: Message) -> None:
         """A helper function which checks for afk user's pings in every message. If someone pings an user who is currently AFK, this function will inform them that the user is currently AFK.
@@ -89,16 +174,54 @@ class Events(Cog):
             The message sent in the server.
         """
 
-        for user in message.mentions:
-            afk_data: Optional[dict] = await coll.find_one({"user_id": user.id})
+        # One lookup for every mentioned user instead of one query per mention
+        afk_users: List[dict] = afk_store.get_many(user.id for user in message.mentions)
 
-            if afk_data is None:
-                continue
+        if not afk_users:
+            return
 
-            else:
-                await message.reply(
-                    self.generate_reply_message(data=afk_data, type="Inform")
-                )
+        # Inform about every AFK user in a single reply, split only if it goes over Discord's message limit
+        replies = [
+            self.generate_reply_message(data=afk_data, type="Inform")
+            for afk_data in afk_users
+        ]
+
+        for content in self.join_replies(replies):
+            await message.reply(content)
+
+    def filter_message(self, message: Message) -> Optional[str]:
+        """Runs the message through `MESSAGE_FILTERS` and returns the name of the filter which dropped it. Returns `None` if the message needs to be handled.
+
+        Parameters
+        ----------
+        message : `discord.Message`
+            The message sent in the server.
+
+        Returns
+        -------
+        `Optional[str]`
+        """
+
+        for name, drop in MESSAGE_FILTERS:
+            if drop(message):
+                MESSAGES_FILTERED.inc(name)
+                return name
+
+        return None
+
+    @Cog.listener()
+    async def on_guild_channel_create(self, channel: GuildChannel) -> None:
+        channel_resolver.invalidate(channel.guild.id)
+
+    @Cog.listener()
+    async def on_guild_channel_delete(self, channel: GuildChannel) -> None:
+        channel_resolver.invalidate(channel.guild.id)
+
+    @Cog.listener()
+    async def on_guild_channel_update(
+        self, before: GuildChannel, after: GuildChannel
+    ) -> None:
+        channel_resolver.invalidate(after.guild.id)
 
     @Cog.listener()
     async def on_message(self, message: Message) -> None:
@@ -110,12 +233,20 @@ class Events(Cog):
             The message that is sent in the server.
         """
 
-        # With this, the bot won't reply to it's own messages
-        if message.author == self.bot.user:
+        start = time.perf_counter()
+
+        # With this, the bot won't handle it's own messages, or any other message that can't involve an AFK user
+        if self.filter_message(message) is not None:
             return
 
-        await self.check_for_afk_user(message)
-        await self.check_for_afk_user_pings(message)
+        try:
+            await self.check_for_afk_user(message)
+
+            if message.mentions:
+                await self.check_for_afk_user_pings(message)
+
+        finally:
+            MESSAGE_LATENCY.observe(time.perf_counter() - start)
 
 
 async def setup(bot: Bot) -> None:
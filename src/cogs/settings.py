@@ -0,0 +1,144 @@
+import logging
+from typing import Literal, get_args
+
+import discord
+from discord import Interaction, Embed, Guild, Member, TextChannel, app_commands as app
+from discord.ext.commands import GroupCog, Bot
+
+from utils.checks import is_guild_owner
+from utils.exc_manager import exception_manager
+from utils.guild_settings import guild_settings
+from utils.helpers import get_channel
+from utils.msg_format import format_as_success_msg
+
+logger = logging.getLogger("snapbot")
+
+# The gateway intents this cog needs, for the guild join and remove events
+INTENTS = ("guilds",)
+
+ChannelName = Literal["log", "confession"]
+
+
+@app.guild_only()
+class Settings(GroupCog, group_name="settings"):
+    def __init__(self, bot: Bot) -> None:
+        self.bot = bot
+
+    async def cog_app_command_error(
+        self, interaction: Interaction, error: app.AppCommandError
+    ) -> None:
+        logger.error(error)
+        await exception_manager(interaction, error)
+
+    @GroupCog.listener()
+    async def on_ready(self) -> None:
+        # Warm the settings cache for every guild the bot is in, using a single query
+        await guild_settings.load(guild.id for guild in self.bot.guilds)
+
+    @GroupCog.listener()
+    async def on_guild_join(self, guild: Guild) -> None:
+        await guild_settings.load([guild.id])
+
+    @GroupCog.listener()
+    async def on_guild_remove(self, guild: Guild) -> None:
+        guild_settings.invalidate(guild.id)
+
+    @app.command(
+        name="channel", description="Sets a channel used by the bot in this server"
+    )
+    @app.describe(
+        name="Which channel do you want to set?",
+        channel="The channel to use",
+    )
+    @app.checks.has_permissions(manage_guild=True)
+    @app.checks.cooldown(1, 10)
+    async def set_channel(
+        self, interaction: Interaction, name: ChannelName, channel: TextChannel
+    ) -> None:
+        """A command which allows server managers to set the channels used by the bot in their server.
+
+        Parameters
+        ----------
+        interaction : `discord.Interaction`
+            Represents a Discord Interaction
+
+        name : `ChannelName`
+            The name of the channel setting.
+
+        channel : `discord.TextChannel`
+            The channel to set.
+        """
+
+        await guild_settings.update(
+            interaction.guild_id, set_fields={f"channels.{name}": channel.id}
+        )
+
+        await interaction.response.send_message(
+            format_as_success_msg(
+                f"The {name} channel has been successfully set to {channel.mention}!"
+            ),
+            ephemeral=True,
+        )
+
+    @app.command(
+        name="owner",
+        description="Sets the member who can access the confession logs in this server",
+    )
+    @app.describe(user="Who should be able to access the confession logs?")
+    @app.checks.cooldown(1, 10)
+    @is_guild_owner()
+    async def set_owner(self, interaction: Interaction, user: Member) -> None:
+        """A command which allows the server owner to set the member who can access the owner-only commands in their server.
+
+        Parameters
+        ----------
+        interaction : `discord.Interaction`
+            Represents a Discord Interaction
+
+        user : `discord.Member`
+            The member to set as the owner.
+        """
+
+        await guild_settings.update(interaction.guild_id, set_fields={"owner": user.id})
+
+        await interaction.response.send_message(
+            format_as_success_msg(
+                f"{user.mention} has been successfully set as the owner!"
+            ),
+            ephemeral=True,
+        )
+
+    @app.command(name="view", description="Displays the bot's settings in this server")
+    @app.checks.has_permissions(manage_guild=True)
+    @app.checks.cooldown(1, 10)
+    async def view(self, interaction: Interaction) -> None:
+        """A command which allows server managers to view the bot's settings in their server.
+
+        Parameters
+        ----------
+        interaction : `discord.Interaction`
+            Represents a Discord Interaction
+        """
+
+        embed = Embed(title="Server Settings", color=discord.Color.random())
+
+        for name in get_args(ChannelName):
+            channel = get_channel(interaction, channel=name)
+            embed.add_field(
+                name=f"{name.title()} Channel",
+                value="Not Set" if channel is None else channel.mention,
+                inline=False,
+            )
+
+        owner = guild_settings.get_value(interaction.guild_id, "owner")
+        embed.add_field(
+            name="Owner",
+            value="Not Set" if owner is None else f"<@{owner}>",
+            inline=False,
+        )
+
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+
+async def setup(bot: Bot) -> None:
+    await bot.add_cog(Settings(bot))
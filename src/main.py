@@ -1,18 +1,34 @@
 import asyncio
 import logging
-import logging.config
 import os
-from typing import List
+import pkgutil
+import time
+from typing import Any, Dict, List, Optional
 
-from discord import Intents
+from discord import Interaction, app_commands as app
 from discord.ext.commands import Bot
 from dotenv import load_dotenv
 
-from utils.cfg_handler import load_config
+from utils.cfg_handler import get_config
+from utils.command_sync import CommandSyncManager
+from utils.db_handler import (
+    close_database,
+    ensure_indexes,
+    load_database_and_collection,
+)
+from utils.gateway import get_gateway_options
+from utils.log_handler import configure_logging, shutdown_logging
+from utils.metrics import Gauge
+from utils.metrics_exporter import MetricsExporter
+from utils.timings import TimedCommandTree, log_command
+from utils.web_client import WebClient
+
+# Measured from here, so the time to ready includes importing the bot's own modules
+STARTED_AT = time.perf_counter()
 
 # Loading environment variables from '.env' and configuration data from 'config.json'
 load_dotenv()
-config_data = load_config()
+config_data = get_config()
 
 
 # Configuring the logger
@@ -27,9 +43,16 @@ class EventsFilter(logging.Filter):
         return record.levelno < logging.ERROR
 
 
-logging.config.dictConfig(config_data["logging"])
+# The file handlers run on a background thread behind a queue, so logging never blocks the event loop
+configure_logging(config_data.logging.to_dict())
 logger = logging.getLogger("snapbot")
 
+EXTENSION_LOAD_SECONDS = Gauge(
+    "extension_load_seconds",
+    "Time taken to load each extension at startup, including executing its module",
+    labels=("extension",),
+)
+
 
 # Initialising SnapBot class
 class SnapBot(Bot):
@@ -39,20 +62,70 @@ class SnapBot(Bot):
     ----------
     Bot : `commands.Bot`
         Represents a Discord Bot.
+
+    **options : `Any`
+        The gateway and cache options( intents, member cache flags, etc. ), as returned by `get_gateway_options`.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, **options: Any) -> None:
         super().__init__(
-            command_prefix=config_data["bot"]["prefix"],
-            intents=Intents.all(),
-            help_command=config_data["bot"]["help_command"],
+            command_prefix=config_data.bot.prefix,
+            help_command=config_data.bot.help_command,
+            tree_cls=TimedCommandTree,
+            **options,
+        )
+
+        # Shared HTTP client used by the cogs for requests to external APIs
+        self.web_client = WebClient(**config_data.http)
+
+        # Syncs the application commands only when they have changed since the last sync
+        self.command_sync = CommandSyncManager(
+            self.tree,
+            load_database_and_collection("command_sync"),
+            **config_data.commands,
+        )
+
+        # Seconds from startup until the bot was first ready. `None` until then
+        self.time_to_ready: Optional[float] = None
+
+        self.metrics_exporter = MetricsExporter(**config_data.metrics)
+        Gauge(
+            "gateway_latency_seconds",
+            "Latency between a gateway heartbeat and its acknowledgement",
+            function=lambda: self.latency,
+        )
+        Gauge(
+            "guilds",
+            "Number of guilds the bot is in",
+            function=lambda: len(self.guilds),
         )
 
     async def setup_hook(self) -> None:
         """To perform any asynchronous setup after the bot is logged in but before it is connected to the WebSocket."""
 
-        # Without this, the application commands won't show up on Discord
-        await self.tree.sync()
+        await self.web_client.start()
+        await self.metrics_exporter.start()
+
+        # Make sure every collection is indexed before any command or event queries it
+        await ensure_indexes()
+
+        # Without this, the application commands won't show up on Discord. Unchanged commands aren't synced again
+        await self.command_sync.sync()
+
+    async def close(self) -> None:
+        """Closes the connection to Discord along with the shared HTTP and database clients and the metrics exporter."""
+
+        await super().close()
+        await self.web_client.close()
+        await self.metrics_exporter.close()
+        close_database()
+
+    async def on_app_command_completion(
+        self, interaction: Interaction, command: app.Command | app.ContextMenu
+    ) -> None:
+        """This function is called when an application command completes successfully. Logs the command along with its timings."""
+
+        log_command(interaction)
 
     async def on_ready(self) -> None:
         """This function is called when the bot's internal cache is ready."""
@@ -61,36 +134,98 @@ class SnapBot(Bot):
         print(f"Logged in as {self.user}")
         logger.info(f"Logged in as {self.user}")
 
+        # `on_ready` fires again after reconnecting, which isn't part of the startup
+        if self.time_to_ready is None:
+            self.time_to_ready = time.perf_counter() - STARTED_AT
+            logger.info(f"Ready in {self.time_to_ready:.2f}s")
 
-bot = SnapBot()
 
+def find_extensions() -> List[str]:
+    """Returns the names of the extensions( cogs ) in the `src/cogs` directory.
 
-async def find_and_load_commands() -> None:
-    """Finds and loads the cogs/commands to the bot."""
+    Returns
+    -------
+    `List[str]`
+    """
 
-    extensions: List[str] = []
+    # Only modules are listed, so '__pycache__' and '__init__.py' are skipped
+    return sorted(
+        f"cogs.{module.name}"
+        for module in pkgutil.iter_modules(["src/cogs"])
+        if not module.ispkg
+    )
 
-    for file in os.listdir("src/cogs"):
-        # Ignore '__pycache__' directory and '__init__.py' file
-        if file in ["__pycache__", "__init__.py"]:
-            continue
 
-        elif file.endswith(".py"):
-            # file[:-3] = filename without .py extension
-            extensions.append(f"cogs.{file[:-3]}")
+def log_extension_timings(timings: Dict[str, float], total: float) -> None:
+    """Logs a table of the time taken to load each extension, and records them in the `extension_load_seconds` metric.
 
-        else:
-            continue
+    Parameters
+    ----------
+    timings : `Dict[str, float]`
+        The seconds taken to load each extension.
+
+    total : `float`
+        The seconds taken to load every extension.
+    """
 
-    for extension in extensions:
+    lines = [f"{'Extension':<20} {'Load (ms)':>12}"]
+
+    for extension, seconds in timings.items():
+        lines.append(f"{extension:<20} {seconds * 1000:>12.1f}")
+        EXTENSION_LOAD_SECONDS.set(seconds, extension)
+
+    lines.append(f"Loaded {len(timings)} extension(s) in {total * 1000:.1f}ms")
+    logger.info("Extension timings:\n" + "\n".join(lines))
+
+
+async def load_extensions(bot: SnapBot, extensions: List[str]) -> Dict[str, float]:
+    """Loads the cogs/commands to the bot concurrently, and returns how long each of them took.
+
+    Each extension is executed once, by `load_extension`, so the timings cover both executing its module and its `setup`. Executing a module is synchronous, so only the awaited part of the setups( e.g. warming caches from the database ) overlaps.
+
+    Parameters
+    ----------
+    bot : `SnapBot`
+        The bot to load the extensions to.
+
+    extensions : `List[str]`
+        The names of the extensions.
+
+    Returns
+    -------
+    `Dict[str, float]`
+        The seconds taken to load each extension.
+    """
+
+    timings: Dict[str, float] = {}
+
+    async def load(extension: str) -> None:
+        start = time.perf_counter()
         await bot.load_extension(extension)
+        timings[extension] = time.perf_counter() - start
+
+    # The cogs don't depend on each other, so their setup runs concurrently
+    await asyncio.gather(*(load(extension) for extension in extensions))
+
+    # Listed in a stable order, rather than the order they finished in
+    return {extension: timings[extension] for extension in extensions}
 
 
 async def main() -> None:
     """The main function responsible for starting the bot."""
 
-    await find_and_load_commands()
-    await bot.start(os.getenv("BOT_TOKEN"))
+    extensions = find_extensions()
+
+    # The intents depend on what the extensions declare, which is read from their source without executing them
+    bot = SnapBot(**get_gateway_options(config_data.gateway, extensions))
+
+    # 'async with' makes sure the bot is closed, along with the database client, when it stops
+    async with bot:
+        start = time.perf_counter()
+        timings = await load_extensions(bot, extensions)
+        log_extension_timings(timings, time.perf_counter() - start)
+
+        await bot.start(os.getenv("BOT_TOKEN"))
 
 
 if __name__ == "__main__":
@@ -100,3 +235,7 @@ if __name__ == "__main__":
     # To prevent flooding of errors when doing Ctrl + C to stop the bot
     except KeyboardInterrupt:
         print("\nShutting down...\n")
+
+    # Write every queued log record before exiting
+    finally:
+        shutdown_logging()
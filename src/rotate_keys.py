@@ -0,0 +1,193 @@
+"""Re-encrypts the encrypted keys in a confession log channel, or in the confession ledger, with the newest encryption key.
+
+Before running this, put the new key in front of the old ones in `ENCRYPTION_KEYS`( e.g. `ENCRYPTION_KEYS=new_key,old_key` ). Once the run completes, the old keys can be removed.
+
+Usage:
+    python src/rotate_keys.py --channel <log channel id> [--chunk-size 100] [--concurrency 5] [--checkpoint rotate_keys.json]
+    python src/rotate_keys.py --ledger [--chunk-size 100] [--concurrency 5] [--checkpoint rotate_ledger.json]
+
+The progress is saved to the checkpoint file after every chunk, so running the same command again resumes an interrupted run. Each source has its own checkpoint file by default, and a checkpoint written for another source is refused.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+from typing import AsyncIterator, Optional
+
+import discord
+from discord import Intents, Message, TextChannel
+from dotenv import load_dotenv
+from pymongo import ASCENDING
+
+from utils.key_rotation import Checkpoint, reencrypt_records
+
+logger = logging.getLogger("snapbot")
+
+
+def get_key_field_index(message: Message) -> Optional[int]:
+    """Returns the index of the 'Encrypted Key' field in the message's confession log embed. Returns `None` if the message isn't a confession log."""
+
+    if not message.embeds or message.embeds[0].title != "Confession Log":
+        return None
+
+    for index, field in enumerate(message.embeds[0].fields):
+        if field.name == "Encrypted Key" and field.value:
+            return index
+
+    return None
+
+
+async def iter_confession_logs(
+    channel: TextChannel, *, bot_id: int, after: Optional[int]
+) -> AsyncIterator[Message]:
+    """Yields the bot's confession log messages in the channel, oldest first, starting after the specified message ID."""
+
+    async for message in channel.history(
+        limit=None,
+        after=None if after is None else discord.Object(id=after),
+        oldest_first=True,
+    ):
+        if message.author.id == bot_id and get_key_field_index(message) is not None:
+            yield message
+
+
+async def save_token(message: Message, token: str) -> None:
+    """Replaces the encrypted key in the message's confession log embed."""
+
+    embed = message.embeds[0]
+    index = get_key_field_index(message)
+    embed.set_field_at(index, name="Encrypted Key", value=token, inline=False)
+
+    await message.edit(embed=embed)
+
+
+async def iter_ledger(after: Optional[int]) -> AsyncIterator[dict]:
+    """Yields the confessions in the ledger ordered by ID, starting after the specified confession ID."""
+
+    # Imported here, since the database connection needs the environment loaded first
+    from utils.confession_ledger import confession_ledger
+
+    query = {} if after is None else {"confession_id": {"$gt": after}}
+
+    async for confession in confession_ledger.coll.find(
+        query, {"confession_id": 1, "ciphertext": 1}
+    ).sort("confession_id", ASCENDING):
+        yield confession
+
+
+async def save_ledger_token(confession: dict, token: str) -> None:
+    """Replaces the ciphertext of the confession in the ledger."""
+
+    from utils.confession_ledger import confession_ledger
+
+    await confession_ledger.coll.update_one(
+        {"_id": confession["_id"]}, {"$set": {"ciphertext": token}}
+    )
+
+
+async def rotate_ledger(arguments: argparse.Namespace) -> None:
+    checkpoint = Checkpoint(arguments.checkpoint, source="ledger")
+
+    logger.info("Re-encrypting the confession ledger")
+
+    progress = await reencrypt_records(
+        iter_ledger(checkpoint.last_id),
+        get_id=lambda confession: confession["confession_id"],
+        get_token=lambda confession: confession["ciphertext"],
+        save=save_ledger_token,
+        checkpoint=checkpoint,
+        chunk_size=arguments.chunk_size,
+        concurrency=arguments.concurrency,
+    )
+
+    logger.info(f"Re-encryption complete: {progress}")
+
+    from utils.db_handler import close_database
+
+    close_database()
+
+
+async def main(arguments: argparse.Namespace) -> None:
+    client = discord.Client(intents=Intents(guilds=True))
+
+    @client.event
+    async def on_ready() -> None:
+        try:
+            channel = client.get_channel(
+                arguments.channel
+            ) or await client.fetch_channel(arguments.channel)
+            checkpoint = Checkpoint(
+                arguments.checkpoint, source=f"channel:{arguments.channel}"
+            )
+
+            logger.info(f"Re-encrypting the confession logs in #{channel.name}")
+
+            progress = await reencrypt_records(
+                iter_confession_logs(
+                    channel, bot_id=client.user.id, after=checkpoint.last_id
+                ),
+                get_id=lambda message: message.id,
+                get_token=lambda message: message.embeds[0]
+                .fields[get_key_field_index(message)]
+                .value,
+                save=save_token,
+                checkpoint=checkpoint,
+                chunk_size=arguments.chunk_size,
+                concurrency=arguments.concurrency,
+            )
+
+            logger.info(f"Re-encryption complete: {progress}")
+
+        finally:
+            await client.close()
+
+    await client.start(os.getenv("BOT_TOKEN"))
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO, format="[ %(levelname)s ] %(message)s")
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
+        "--channel",
+        type=int,
+        help="The ID of the confession log channel",
+    )
+    source.add_argument(
+        "--ledger",
+        action="store_true",
+        help="Re-encrypt the confession ledger stored in the database instead",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=100,
+        help="The number of messages processed at a time",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=5,
+        help="The maximum number of messages edited at the same time",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        help="The path of the checkpoint file. Defaults to 'rotate_keys.json' for a channel and 'rotate_ledger.json' for the ledger",
+    )
+
+    try:
+        arguments = parser.parse_args()
+
+        # Each source has its own checkpoint, since their IDs can't be compared
+        if arguments.checkpoint is None:
+            arguments.checkpoint = (
+                "rotate_ledger.json" if arguments.ledger else "rotate_keys.json"
+            )
+
+        asyncio.run(rotate_ledger(arguments) if arguments.ledger else main(arguments))
+
+    except KeyboardInterrupt:
+        print("\nStopped. Run the same command again to resume.\n")
@@ -0,0 +1,167 @@
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from discord import Embed
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo.results import UpdateResult
+
+from utils.cache import TTLCache
+from utils.cfg_handler import get_config
+from utils.db_handler import load_database_and_collection
+from utils.timings import timed
+
+
+class AboutStore:
+    """A read-through cache in front of the `about_data` collection, holding both the users' about data and their built about embeds.
+
+    Writes to the about data should go through `update`, which keeps the cache consistent with the database.
+
+    Parameters
+    ----------
+    coll : `AsyncIOMotorCollection`
+        The collection holding the about data.
+
+    max_size : `int`
+        The maximum number of users whose data is cached.
+
+    ttl : `float`
+        The number of seconds a user's cached data stays valid for.
+
+    negative_ttl : `float`
+        The number of seconds the absence of a user's data stays cached for.
+    """
+
+    def __init__(
+        self,
+        coll: AsyncIOMotorCollection,
+        *,
+        max_size: int,
+        ttl: float,
+        negative_ttl: float,
+    ) -> None:
+        self.coll = coll
+        self.profiles = TTLCache(
+            max_size=max_size,
+            ttl=ttl,
+            negative_ttl=negative_ttl,
+            name="about_profiles",
+        )
+        self.embeds = TTLCache(max_size=max_size, ttl=ttl, name="about_embeds")
+
+    async def get(self, user_id: int) -> Optional[dict]:
+        """Returns the about data of the specified user, fetching it from the database if it isn't cached. Returns `None` if the user has no about data.
+
+        Parameters
+        ----------
+        user_id : `int`
+            The ID of the user.
+
+        Returns
+        -------
+        `Optional[dict]`
+        """
+
+        async def fetch() -> dict:
+            # An empty dict is cached for users without any data, so repeated lookups for them are cached as well
+            with timed("db"):
+                return await self.coll.find_one({"user_id": user_id}) or {}
+
+        return await self.profiles.get_or_fetch(user_id, fetch) or None
+
+    def get_embed(
+        self, user_id: int, *, data: dict, builder: Callable[[dict], Embed]
+    ) -> Embed:
+        """Returns the about embed of the specified user, building it from the provided data if it isn't cached.
+
+        Each embed is cached along with the about data it was built from, and is only reused for that same data. An embed built from data which was updated while the command was waiting on Discord is therefore never served for the newer data.
+
+        Parameters
+        ----------
+        user_id : `int`
+            The ID of the user.
+
+        data : `dict`
+            The about data of the user.
+
+        builder : `Callable[[dict], Embed]`
+            A function which builds the about embed from the about data.
+
+        Returns
+        -------
+        `Embed`
+        """
+
+        cached: Optional[Tuple[dict, Embed]] = self.embeds.get(user_id)
+
+        # Compared by identity, since every fetch of the about data returns a new dict
+        if cached is not None and cached[0] is data:
+            return cached[1]
+
+        embed = builder(data)
+        self.embeds.set(user_id, (data, embed))
+        return embed
+
+    async def update(
+        self,
+        user_id: int,
+        *,
+        set_fields: Optional[Dict[str, Any]] = None,
+        unset_fields: Optional[Iterable[str]] = None,
+        upsert: bool = True,
+    ) -> UpdateResult:
+        """Sets and/or unsets fields of the specified user's about data in a single atomic database operation, then invalidates the user's cached data.
+
+        Parameters
+        ----------
+        user_id : `int`
+            The ID of the user.
+
+        set_fields : `Optional[Dict[str, Any]]`
+            The fields to set, mapped to their new values. Defaults to `None`.
+
+        unset_fields : `Optional[Iterable[str]]`
+            The names of the fields to remove. Defaults to `None`.
+
+        upsert : `bool`
+            Whether to create the user's about data if it doesn't exist yet. Defaults to `True`.
+
+        Returns
+        -------
+        `UpdateResult`
+        """
+
+        update: Dict[str, dict] = {}
+
+        if set_fields:
+            update["$set"] = dict(set_fields)
+
+        if unset_fields:
+            update["$unset"] = {field: "" for field in unset_fields}
+
+        if not update:
+            raise ValueError("At least one field must be set or unset.")
+
+        try:
+            with timed("db"):
+                return await self.coll.update_one(
+                    {"user_id": user_id}, update, upsert=upsert
+                )
+
+        finally:
+            self.invalidate(user_id)
+
+    def invalidate(self, user_id: int) -> None:
+        """Removes the cached about data and embed of the specified user.
+
+        Parameters
+        ----------
+        user_id : `int`
+            The ID of the user.
+        """
+
+        self.profiles.invalidate(user_id)
+        self.embeds.invalidate(user_id)
+
+
+about_store = AboutStore(
+    load_database_and_collection("about_data"), **get_config().cache.about
+)
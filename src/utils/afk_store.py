@@ -0,0 +1,225 @@
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+from utils.db_handler import load_database_and_collection
+from utils.metrics import Counter, Gauge
+from utils.timings import timed
+
+logger = logging.getLogger("snapbot")
+
+
+class AFKStore:
+    """An in-memory index of the users who are currently AFK, backed by the `afk_data` collection.
+
+    Reads are served from memory and never touch the database. Writes go to the database and update the index in the same call, so the index always mirrors the collection.
+
+    Parameters
+    ----------
+    coll : `AsyncIOMotorCollection`
+        The collection holding the AFK records.
+    """
+
+    def __init__(self, coll: AsyncIOMotorCollection) -> None:
+        self.coll = coll
+        self.records: Dict[int, dict] = {}
+        self.loaded = False
+
+        # Lookup counters, useful for checking how many database reads the index saves
+        self.hits = 0
+        self.misses = 0
+
+    async def load(self) -> None:
+        """Loads every AFK record from the database into memory. Does nothing if the store is already loaded."""
+
+        if self.loaded:
+            return
+
+        async for data in self.coll.find({}):
+            self.records[data["user_id"]] = data
+
+        self.loaded = True
+        logger.info(f"Loaded {len(self.records)} AFK record(s) into memory")
+
+    def get(self, user_id: int) -> Optional[dict]:
+        """Returns the AFK record of the specified user. Returns `None` if the user is not AFK.
+
+        Parameters
+        ----------
+        user_id : `int`
+            The ID of the user.
+
+        Returns
+        -------
+        `Optional[dict]`
+        """
+
+        data = self.records.get(user_id)
+
+        if data is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        return data
+
+    def get_many(self, user_ids: Iterable[int]) -> List[dict]:
+        """Returns the AFK records of every specified user who is currently AFK, in the order the IDs were given. Duplicate IDs are only returned once.
+
+        Parameters
+        ----------
+        user_ids : `Iterable[int]`
+            The IDs of the users.
+
+        Returns
+        -------
+        `List[dict]`
+        """
+
+        found: Dict[int, dict] = {}
+
+        for user_id in user_ids:
+            if user_id in found:
+                continue
+
+            data = self.get(user_id)
+
+            if data is not None:
+                found[user_id] = data
+
+        return list(found.values())
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self.records
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    async def add(self, data: dict) -> None:
+        """Marks a user as AFK by storing the provided record in the database and in memory.
+
+        The record is added to memory before the database is touched, so concurrent callers see the user as AFK right away. If the insert fails, the record is removed from memory again and the error is raised.
+
+        Parameters
+        ----------
+        data : `dict`
+            The AFK record. Must contain the `user_id` key.
+        """
+
+        self.records[data["user_id"]] = data
+
+        try:
+            with timed("db"):
+                await self.coll.insert_one(dict(data))
+
+        # Also covers cancellation, which would leave the index out of sync all the same
+        except BaseException:
+            if self.records.get(data["user_id"]) is data:
+                del self.records[data["user_id"]]
+
+            raise
+
+    async def pop(self, user_id: int) -> Optional[dict]:
+        """Removes the AFK status of the specified user and returns their record. Returns `None` if the user was not AFK.
+
+        The record is removed from memory before the database is touched, so concurrent callers can't both act on the same record. If the delete fails, the record is put back in memory and the error is raised.
+
+        Parameters
+        ----------
+        user_id : `int`
+            The ID of the user.
+
+        Returns
+        -------
+        `Optional[dict]`
+        """
+
+        data = self.records.pop(user_id, None)
+
+        if data is not None:
+            try:
+                with timed("db"):
+                    await self.coll.delete_one({"user_id": user_id})
+
+            # The user is still AFK in the database, so the index has to say so as well
+            except BaseException:
+                self.records.setdefault(user_id, data)
+                raise
+
+        return data
+
+    def get_expired(self, now: datetime, *, limit: int) -> List[dict]:
+        """Returns up to `limit` AFK records which expired at or before `now`, oldest expiry first. Records without an expiry never expire.
+
+        Parameters
+        ----------
+        now : `datetime`
+            The current time.
+
+        limit : `int`
+            The maximum number of records to return.
+
+        Returns
+        -------
+        `List[dict]`
+        """
+
+        expired = [
+            data
+            for data in self.records.values()
+            if data.get("expires_at") is not None and data["expires_at"] <= now
+        ]
+        expired.sort(key=lambda data: data["expires_at"])
+
+        return expired[:limit]
+
+    async def pop_many(self, user_ids: Iterable[int]) -> List[dict]:
+        """Removes the AFK status of every specified user, using a single query, and returns the records which were removed. Same as `pop`, the records are removed from memory first, and put back if the delete fails.
+
+        Parameters
+        ----------
+        user_ids : `Iterable[int]`
+            The IDs of the users.
+
+        Returns
+        -------
+        `List[dict]`
+        """
+
+        removed = [
+            data
+            for data in (self.records.pop(user_id, None) for user_id in user_ids)
+            if data is not None
+        ]
+
+        if removed:
+            try:
+                with timed("db"):
+                    await self.coll.delete_many(
+                        {"user_id": {"$in": [data["user_id"] for data in removed]}}
+                    )
+
+            except BaseException:
+                for data in removed:
+                    self.records.setdefault(data["user_id"], data)
+
+                raise
+
+        return removed
+
+
+afk_store = AFKStore(load_database_and_collection("afk_data"))
+
+Counter(
+    "afk_lookups_total",
+    "Number of AFK lookups served from memory, by whether the user was AFK. Each one used to be a database query",
+    labels=("result",),
+    function=lambda: {("hit",): afk_store.hits, ("miss",): afk_store.misses},
+)
+Gauge(
+    "afk_records",
+    "Number of AFK records held in memory",
+    function=lambda: len(afk_store),
+)
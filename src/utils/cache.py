@@ -0,0 +1,250 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from utils.metrics import Counter, Gauge
+
+
+class TTLCache:
+    """A bounded in-memory cache whose entries expire after a set amount of time. When the cache is full, the least recently used entry is evicted.
+
+    Parameters
+    ----------
+    max_size : `int`
+        The maximum number of entries the cache can hold.
+
+    ttl : `float`
+        The number of seconds an entry stays valid for.
+
+    negative_ttl : `Optional[float]`
+        The number of seconds an empty( falsy ) value fetched through `get_or_fetch` stays valid for. Defaults to `ttl` if not provided.
+
+    name : `Optional[str]`
+        The name the cache's statistics are exported under, in the `cache_*` metrics. A cache created with the same name replaces the previous one. Defaults to `None`, which doesn't export them.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_size: int,
+        ttl: float,
+        negative_ttl: Optional[float] = None,
+        name: Optional[str] = None,
+    ) -> None:
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = ttl if negative_ttl is None else negative_ttl
+
+        # Maps each key to a tuple of (expiry time, value), ordered from least to most recently used
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._pending: Dict[Hashable, asyncio.Task] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.coalesced = 0
+
+        if name is not None:
+            _caches[name] = self
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry[0] > time.monotonic()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Returns the value stored for the specified key. Returns `default` if the key is not cached or its entry has expired.
+
+        Parameters
+        ----------
+        key : `Hashable`
+            The key to look up.
+
+        default : `Any`
+            The value to return if nothing valid is cached. Defaults to `None`.
+
+        Returns
+        -------
+        `Any`
+        """
+
+        entry = self._entries.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return default
+
+        expires_at, value = entry
+
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, *, ttl: Optional[float] = None) -> None:
+        """Stores a value for the specified key, evicting the least recently used entry if the cache is full.
+
+        Parameters
+        ----------
+        key : `Hashable`
+            The key to store the value under.
+
+        value : `Any`
+            The value to store.
+
+        ttl : `Optional[float]`
+            The number of seconds this entry stays valid for. Defaults to the cache's `ttl` if not provided.
+        """
+
+        ttl = self.ttl if ttl is None else ttl
+
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """Removes the entry stored for the specified key, if any. A fetch for the key which is still in flight won't store its result either.
+
+        Parameters
+        ----------
+        key : `Hashable`
+            The key to remove.
+        """
+
+        self._entries.pop(key, None)
+        self._pending.pop(key, None)
+
+    def clear(self) -> None:
+        """Removes every entry from the cache."""
+
+        self._entries.clear()
+        self._pending.clear()
+
+    async def get_or_fetch(
+        self, key: Hashable, fetch: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Returns the value cached for the specified key, fetching and caching it if it isn't cached yet. Concurrent calls for the same key share a single fetch.
+
+        Empty( falsy ) values are cached using `negative_ttl`, while `None` is treated as a failed fetch and is never cached.
+
+        Parameters
+        ----------
+        key : `Hashable`
+            The key to look up.
+
+        fetch : `Callable[[], Awaitable[Any]]`
+            A coroutine function which fetches the value if it isn't cached.
+
+        Returns
+        -------
+        `Any`
+        """
+
+        # A sentinel is used here so that cached falsy values are still returned as hits
+        value = self.get(key, _MISSING)
+
+        if value is not _MISSING:
+            return value
+
+        task = self._pending.get(key)
+
+        if task is None:
+            task = asyncio.create_task(self._fetch(key, fetch))
+            self._pending[key] = task
+
+        else:
+            self.coalesced += 1
+
+        # Shielded so that one caller being cancelled doesn't cancel the fetch for everyone else
+        return await asyncio.shield(task)
+
+    async def _fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        task = asyncio.current_task()
+
+        try:
+            value = await fetch()
+
+            # The key may have been invalidated while fetching, in which case the value could be stale
+            if value is not None and self._pending.get(key) is task:
+                self.set(key, value, ttl=self.ttl if value else self.negative_ttl)
+
+            return value
+
+        finally:
+            if self._pending.get(key) is task:
+                del self._pending[key]
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """The cache's usage statistics, useful for sizing the cache."""
+
+        lookups = self.hits + self.misses
+
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "coalesced": self.coalesced,
+        }
+
+
+_MISSING = object()
+
+# The caches whose statistics are exported, by name
+_caches: Dict[str, TTLCache] = {}
+
+
+def _count_per_cache(attribute: str) -> Dict[Tuple[str, ...], float]:
+    return {(name,): getattr(cache, attribute) for name, cache in _caches.items()}
+
+
+Counter(
+    "cache_lookups_total",
+    "Number of lookups in each cache, by result",
+    labels=("cache", "result"),
+    function=lambda: {
+        **{(name, "hit"): cache.hits for name, cache in _caches.items()},
+        **{(name, "miss"): cache.misses for name, cache in _caches.items()},
+    },
+)
+Counter(
+    "cache_evictions_total",
+    "Number of entries evicted from each cache to make room for new ones",
+    labels=("cache",),
+    function=lambda: _count_per_cache("evictions"),
+)
+Counter(
+    "cache_expirations_total",
+    "Number of entries of each cache found expired",
+    labels=("cache",),
+    function=lambda: _count_per_cache("expirations"),
+)
+Counter(
+    "cache_coalesced_fetches_total",
+    "Number of lookups of each cache which shared a fetch already in flight",
+    labels=("cache",),
+    function=lambda: _count_per_cache("coalesced"),
+)
+Gauge(
+    "cache_entries",
+    "Number of entries held in each cache",
+    labels=("cache",),
+    function=lambda: {(name,): len(cache) for name, cache in _caches.items()},
+)
@@ -1,5 +1,145 @@
 import json
-from typing import Any, Dict
+import os
+import tempfile
+import time
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+CONFIG_PATH = "config.json"
+
+# Minimum number of seconds between two checks of the file's modification time
+RELOAD_CHECK_INTERVAL = 1.0
+
+
+class ConfigSection(Mapping[str, Any]):
+    """A read-only view over a section of the configuration data. Keys can be read either as attributes or as items, and nested sections are `ConfigSection`s as well.
+
+    Parameters
+    ----------
+    data : `Dict[str, Any]`
+        The configuration data of this section.
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        object.__setattr__(
+            self, "_data", {key: _freeze(value) for key, value in data.items()}
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        # Private names are never configuration keys, and looking them up in `_data` could recurse
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        try:
+            return self._data[name]
+
+        except KeyError:
+            raise AttributeError(f"No configuration key named '{name}'") from None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(
+            "Configuration data is read-only. Use `save_config` instead."
+        )
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"ConfigSection({self.to_dict()!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns a mutable copy of this section's data.
+
+        Returns
+        -------
+        `Dict[str, Any]`
+        """
+
+        return {key: _thaw(value) for key, value in self._data.items()}
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return ConfigSection(value)
+
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    if isinstance(value, ConfigSection):
+        return value.to_dict()
+
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+
+    return value
+
+
+# The parsed configuration data along with the modification time of the file it was parsed from
+_config: Optional[ConfigSection] = None
+_config_mtime: Optional[float] = None
+_last_checked: float = 0.0
+
+
+def reload_config() -> ConfigSection:
+    """Parses `config.json` again, regardless of whether it has changed, and replaces the cached configuration data.
+
+    Returns
+    -------
+    `ConfigSection`
+    """
+
+    global _config, _config_mtime, _last_checked
+
+    mtime = os.stat(CONFIG_PATH).st_mtime
+
+    with open(CONFIG_PATH, "r") as file:
+        _config = ConfigSection(json.load(file))
+
+    _config_mtime = mtime
+    _last_checked = time.monotonic()
+
+    return _config
+
+
+def get_config() -> ConfigSection:
+    """Returns the configuration data from `config.json`. The file is only parsed again if it has been modified since it was last parsed.
+
+    Returns
+    -------
+    `ConfigSection`
+        Read-only configuration data.
+    """
+
+    global _last_checked
+
+    if _config is None:
+        return reload_config()
+
+    now = time.monotonic()
+
+    if now - _last_checked >= RELOAD_CHECK_INTERVAL:
+        _last_checked = now
+
+        try:
+            if os.stat(CONFIG_PATH).st_mtime != _config_mtime:
+                return reload_config()
+
+        # Keep using the cached data if the file is temporarily unavailable
+        except OSError:
+            pass
+
+    return _config
 
 
 def load_config() -> Dict[str, Any]:
@@ -8,15 +148,14 @@ def load_config() -> Dict[str, Any]:
     Returns
     -------
     `Dict[str, Any]`
-        Configuration data in `dict` format.
+        A mutable copy of the configuration data in `dict` format.
     """
 
-    with open("config.json", "r") as file:
-        return json.load(file)
+    return get_config().to_dict()
 
 
 def save_config(*, data: Dict[str, Any]) -> None:
-    """Writes the provided configuration data to `config.json`.
+    """Writes the provided configuration data to `config.json` and refreshes the cached configuration data. The file is replaced atomically, so it is never left partially written.
 
     Parameters
     ----------
@@ -24,5 +163,19 @@ def save_config(*, data: Dict[str, Any]) -> None:
         The data to dump to `config.json`.
     """
 
-    with open("config.json", "w") as file:
-        json.dump(data, file, indent=4)
+    directory = os.path.dirname(os.path.abspath(CONFIG_PATH))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".config-", suffix=".json")
+
+    try:
+        with os.fdopen(fd, "w") as file:
+            json.dump(data, file, indent=4)
+            file.flush()
+            os.fsync(file.fileno())
+
+        os.replace(temp_path, CONFIG_PATH)
+
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+    reload_config()
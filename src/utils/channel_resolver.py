@@ -0,0 +1,109 @@
+from typing import Dict, Mapping, Optional, Tuple
+
+from discord import Guild, TextChannel
+
+from utils.cfg_handler import ConfigSection, get_config
+from utils.guild_settings import guild_settings
+
+
+class ChannelResolver:
+    """Resolves logical channel names( like `log` or `confession` ) to the channels they are configured as in a guild.
+
+    Channels are looked up by their ID in the guild's channel map, and the resolved channels are cached per guild. The cache of a guild must be invalidated whenever one of its channels is created, deleted or updated. Changes to a guild's settings are detected automatically.
+    """
+
+    def __init__(self) -> None:
+        # Maps each guild to the settings its channels were resolved from, along with the resolved channels
+        self.cache: Dict[
+            int, Tuple[Optional[dict], Dict[str, Optional[TextChannel]]]
+        ] = {}
+
+        # The configuration data the cache was built from. The whole cache is dropped once it changes
+        self.config: Optional[ConfigSection] = None
+
+    def get_channel_ids(self, guild_id: int) -> Mapping[str, int]:
+        """Returns the channel mapping of the specified guild.
+
+        The guild's settings take priority, followed by the guild's mapping under `server_settings.guilds` in `config.json` and finally the global `server_settings.channels` mapping.
+
+        Parameters
+        ----------
+        guild_id : `int`
+            The ID of the guild.
+
+        Returns
+        -------
+        `Mapping[str, int]`
+        """
+
+        channels: Optional[Dict[str, int]] = guild_settings.get_value(
+            guild_id, "channels"
+        )
+
+        if channels:
+            return channels
+
+        server_settings = get_config().server_settings
+        guild_config = server_settings.get("guilds", {}).get(str(guild_id))
+
+        if guild_config is not None and "channels" in guild_config:
+            return guild_config.channels
+
+        return server_settings.channels
+
+    def resolve(self, guild: Guild, name: str) -> Optional[TextChannel]:
+        """Returns the channel configured under the specified name in the guild. Returns `None` if no channel is configured or the configured channel doesn't exist.
+
+        Parameters
+        ----------
+        guild : `discord.Guild`
+            The guild to resolve the channel in.
+
+        name : `str`
+            The logical name of the channel.
+
+        Returns
+        -------
+        `Optional[TextChannel]`
+        """
+
+        config = get_config()
+
+        if config is not self.config:
+            self.cache.clear()
+            self.config = config
+
+        name = name.lower()
+        settings = guild_settings.get(guild.id)
+        source, channels = self.cache.get(guild.id, (None, None))
+
+        # The guild's settings were replaced since its channels were resolved
+        if channels is None or source is not settings:
+            channels = {}
+            self.cache[guild.id] = (settings, channels)
+
+        if name not in channels:
+            channel_id = self.get_channel_ids(guild.id).get(name)
+            channels[name] = (
+                None if channel_id is None else guild.get_channel(channel_id)
+            )
+
+        return channels[name]
+
+    def invalidate(self, guild_id: Optional[int] = None) -> None:
+        """Drops the resolved channels of the specified guild, or of every guild if no guild is specified.
+
+        Parameters
+        ----------
+        guild_id : `Optional[int]`
+            The ID of the guild. Defaults to `None`.
+        """
+
+        if guild_id is None:
+            self.cache.clear()
+
+        else:
+            self.cache.pop(guild_id, None)
+
+
+channel_resolver = ChannelResolver()
@@ -2,9 +2,8 @@ from json import load
 from discord import Interaction, app_commands as app
 
 from utils.errors import NotValidURL, NotOwner
-from utils.cfg_handler import load_config
-
-config_data = load_config()
+from utils.cfg_handler import get_config
+from utils.guild_settings import guild_settings
 
 
 def is_valid_attachment_url():
@@ -22,12 +21,40 @@ def is_valid_attachment_url():
 
 
 def is_owner():
-    """A check which returns `True` if the command invoker is the bot owner. Else, `False`."""
+    """A check which returns `True` if the command invoker is the bot owner or the owner set in the guild's settings. Else, `False`.
+
+    The owner set in a guild's settings passes this check in that guild only, so commands using it must keep their data scoped to `interaction.guild_id`.
+    """
 
     def predicate(interaction: Interaction) -> bool | NotOwner:
-        if interaction.user.id == config_data["bot"]["owner"]:
+        if interaction.user.id == get_config().bot.owner:
+            return True
+
+        if (
+            interaction.guild_id is not None
+            and interaction.user.id
+            == guild_settings.get_value(interaction.guild_id, "owner")
+        ):
             return True
 
         return False
 
     return app.check(predicate)
+
+
+def is_guild_owner():
+    """A check which returns `True` if the command invoker owns the guild or is the bot owner. Else, raises `NotOwner`."""
+
+    def predicate(interaction: Interaction) -> bool | NotOwner:
+        if interaction.user.id == get_config().bot.owner:
+            return True
+
+        if (
+            interaction.guild is not None
+            and interaction.user.id == interaction.guild.owner_id
+        ):
+            return True
+
+        raise NotOwner()
+
+    return app.check(predicate)
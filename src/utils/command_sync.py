@@ -0,0 +1,158 @@
+import hashlib
+import json
+import logging
+from datetime import datetime
+from typing import List, Optional, Sequence
+
+import discord
+from discord import app_commands as app
+from discord.abc import Snowflake
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo.errors import PyMongoError
+
+logger = logging.getLogger("snapbot")
+
+
+class CommandSyncManager:
+    """Syncs the application commands with Discord only when they have changed since the last sync.
+
+    The commands of each scope( globally, or a single guild ) are serialized into the same payload `CommandTree.sync` sends, and its hash is stored in the `command_sync` collection after every sync. A restart without any command changes therefore makes no sync calls at all.
+
+    Parameters
+    ----------
+    tree : `app.CommandTree`
+        The command tree to sync.
+
+    coll : `AsyncIOMotorCollection`
+        The collection holding the hash of the last synced payload of each scope.
+
+    dev_guilds : `Sequence[int]`
+        The IDs of the development guilds. The global commands are copied to each of them and synced as guild commands, which show up instantly. Defaults to none.
+
+    sync_global : `bool`
+        Whether the global commands are synced. Can be turned off while developing, so that only the development guilds get the changes. Defaults to `True`.
+    """
+
+    def __init__(
+        self,
+        tree: app.CommandTree,
+        coll: AsyncIOMotorCollection,
+        *,
+        dev_guilds: Sequence[int] = (),
+        sync_global: bool = True,
+    ) -> None:
+        self.tree = tree
+        self.coll = coll
+        self.dev_guilds = list(dev_guilds)
+        self.sync_global = sync_global
+
+    def get_payload(self, guild: Optional[Snowflake] = None) -> List[dict]:
+        """Returns the payload of the commands in the specified scope, in a stable order.
+
+        Parameters
+        ----------
+        guild : `Optional[Snowflake]`
+            The guild whose commands to serialize. Defaults to `None`, which serializes the global commands.
+
+        Returns
+        -------
+        `List[dict]`
+        """
+
+        return sorted(
+            (command.to_dict() for command in self.tree.get_commands(guild=guild)),
+            key=lambda payload: (payload.get("type", 1), payload["name"]),
+        )
+
+    @staticmethod
+    def hash_payload(payload: List[dict]) -> str:
+        """Returns the SHA-256 hash of the canonical JSON form of the payload.
+
+        Parameters
+        ----------
+        payload : `List[dict]`
+            The payload to hash.
+
+        Returns
+        -------
+        `str`
+        """
+
+        canonical = json.dumps(
+            payload, sort_keys=True, separators=(",", ":"), default=str
+        )
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    async def sync_scope(
+        self, guild: Optional[Snowflake] = None, *, force: bool = False
+    ) -> bool:
+        """Syncs the commands of the specified scope if they have changed since the last sync.
+
+        If the stored hash can't be read, the commands are synced anyway, since a redundant sync is safer than a missed one.
+
+        Parameters
+        ----------
+        guild : `Optional[Snowflake]`
+            The guild whose commands to sync. Defaults to `None`, which syncs the global commands.
+
+        force : `bool`
+            Whether to sync even if the commands haven't changed. Defaults to `False`.
+
+        Returns
+        -------
+        `bool`
+            Whether the commands were synced.
+        """
+
+        scope = "global" if guild is None else str(guild.id)
+        payload = self.get_payload(guild)
+        digest = self.hash_payload(payload)
+
+        # The same database can be shared by several bots, so the hashes are kept per application
+        key = {"application_id": self.tree.client.application_id, "scope": scope}
+
+        try:
+            stored: Optional[dict] = await self.coll.find_one(key)
+
+        except PyMongoError as error:
+            logger.error(f"Couldn't read the command hash of '{scope}': {error}")
+            stored = None
+
+        if not force and stored is not None and stored.get("hash") == digest:
+            logger.info(
+                f"Application commands of '{scope}' are unchanged, skipping sync"
+            )
+            return False
+
+        await self.tree.sync(guild=guild)
+
+        try:
+            await self.coll.update_one(
+                key,
+                {"$set": {"hash": digest, "synced_at": datetime.now()}},
+                upsert=True,
+            )
+
+        except PyMongoError as error:
+            logger.error(f"Couldn't store the command hash of '{scope}': {error}")
+
+        logger.info(f"Synced {len(payload)} application command(s) of '{scope}'")
+        return True
+
+    async def sync(self, *, force: bool = False) -> None:
+        """Syncs the global commands and the commands of every development guild, skipping the scopes which haven't changed.
+
+        Parameters
+        ----------
+        force : `bool`
+            Whether to sync every scope even if it hasn't changed. Defaults to `False`.
+        """
+
+        if self.sync_global:
+            await self.sync_scope(force=force)
+
+        for guild_id in self.dev_guilds:
+            guild = discord.Object(id=guild_id)
+            self.tree.copy_global_to(guild=guild)
+
+            await self.sync_scope(guild, force=force)
@@ -0,0 +1,148 @@
+from datetime import datetime
+from typing import List, Optional
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import DESCENDING, ReturnDocument
+
+from utils.db_handler import load_database_and_collection
+from utils.timings import timed
+
+
+class ConfessionLedger:
+    """A persistent record of every confession, stored in the `confessions` collection.
+
+    Each confession gets a short sequential ID, which can be used to look it up instead of its long encrypted key.
+
+    Parameters
+    ----------
+    coll : `AsyncIOMotorCollection`
+        The collection holding the confessions.
+
+    counters : `AsyncIOMotorCollection`
+        The collection holding the sequence used for the confession IDs.
+    """
+
+    def __init__(
+        self, coll: AsyncIOMotorCollection, counters: AsyncIOMotorCollection
+    ) -> None:
+        self.coll = coll
+        self.counters = counters
+
+    async def next_id(self) -> int:
+        """Reserves and returns the next confession ID.
+
+        Returns
+        -------
+        `int`
+        """
+
+        with timed("db"):
+            counter: dict = await self.counters.find_one_and_update(
+                {"_id": "confessions"},
+                {"$inc": {"seq": 1}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+
+        return counter["seq"]
+
+    async def add(
+        self,
+        confession_id: int,
+        *,
+        guild_id: int,
+        ciphertext: str,
+        log_message_id: int,
+        confession_message_id: int,
+    ) -> None:
+        """Stores a confession in the ledger.
+
+        Parameters
+        ----------
+        confession_id : `int`
+            The ID reserved for the confession using `next_id`.
+
+        guild_id : `int`
+            The ID of the guild the confession was posted in.
+
+        ciphertext : `str`
+            The encrypted user ID of the user who made the confession.
+
+        log_message_id : `int`
+            The ID of the confession's message in the log channel.
+
+        confession_message_id : `int`
+            The ID of the confession's message in the confession channel.
+        """
+
+        with timed("db"):
+            await self.coll.insert_one(
+                {
+                    "confession_id": confession_id,
+                    "guild_id": guild_id,
+                    "ciphertext": ciphertext,
+                    "timestamp": datetime.now(),
+                    "log_message_id": log_message_id,
+                    "confession_message_id": confession_message_id,
+                }
+            )
+
+    async def get(self, confession_id: int, *, guild_id: int) -> Optional[dict]:
+        """Returns the specified confession. Returns `None` if the confession doesn't exist in the guild.
+
+        Parameters
+        ----------
+        confession_id : `int`
+            The ID of the confession.
+
+        guild_id : `int`
+            The ID of the guild the confession was posted in.
+
+        Returns
+        -------
+        `Optional[dict]`
+        """
+
+        with timed("db"):
+            return await self.coll.find_one(
+                {"guild_id": guild_id, "confession_id": confession_id}
+            )
+
+    async def page(
+        self, *, guild_id: int, before: Optional[int] = None, limit: int = 10
+    ) -> List[dict]:
+        """Returns a page of the guild's confessions, newest first.
+
+        Pages are fetched using the last confession ID of the previous page as a cursor, rather than by skipping confessions, so every page is an indexed range query no matter how large the ledger is.
+
+        Parameters
+        ----------
+        guild_id : `int`
+            The ID of the guild.
+
+        before : `Optional[int]`
+            Only confessions with an ID lower than this are returned. Defaults to `None`, which returns the newest confessions.
+
+        limit : `int`
+            The maximum number of confessions to return. Defaults to `10`.
+
+        Returns
+        -------
+        `List[dict]`
+        """
+
+        query: dict = {"guild_id": guild_id}
+
+        if before is not None:
+            query["confession_id"] = {"$lt": before}
+
+        cursor = self.coll.find(query).sort("confession_id", DESCENDING).limit(limit)
+
+        with timed("db"):
+            return await cursor.to_list(length=limit)
+
+
+confession_ledger = ConfessionLedger(
+    load_database_and_collection("confessions"),
+    load_database_and_collection("counters"),
+)
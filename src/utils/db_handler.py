@@ -1,4 +1,7 @@
+import logging
 import os
+import time
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
 from motor.motor_asyncio import (
     AsyncIOMotorClient,
@@ -6,6 +9,88 @@ from motor.motor_asyncio import (
     AsyncIOMotorDatabase,
 )
 
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import PyMongoError
+
+from utils.cfg_handler import get_config
+
+logger = logging.getLogger("snapbot")
+
+# The process-wide client, created on first use and shared by every cog and modal
+_client: Optional[AsyncIOMotorClient] = None
+_collections: Dict[str, AsyncIOMotorCollection] = {}
+
+# Maps the keys of the `database` section in `config.json` to the client options they configure
+CLIENT_OPTIONS: Dict[str, str] = {
+    "max_pool_size": "maxPoolSize",
+    "min_pool_size": "minPoolSize",
+    "max_idle_time_ms": "maxIdleTimeMS",
+    "connect_timeout_ms": "connectTimeoutMS",
+    "server_selection_timeout_ms": "serverSelectionTimeoutMS",
+    "socket_timeout_ms": "socketTimeoutMS",
+}
+
+# The indexes every collection should have, mapped by collection name
+INDEXES: Dict[str, List[Dict[str, Any]]] = {
+    "afk_data": [
+        {"keys": [("user_id", ASCENDING)], "name": "user_id_unique", "unique": True},
+        # A backstop for the AFK sweeper, which restores the nicknames of expired records well before this. Records without `expires_at` never expire
+        {
+            "keys": [("expires_at", ASCENDING)],
+            "name": "expires_at_ttl",
+            "expireAfterSeconds": 86400,
+        },
+    ],
+    "about_data": [
+        {"keys": [("user_id", ASCENDING)], "name": "user_id_unique", "unique": True},
+    ],
+    "guild_settings": [
+        {"keys": [("guild_id", ASCENDING)], "name": "guild_id_unique", "unique": True},
+    ],
+    "command_sync": [
+        {
+            "keys": [("application_id", ASCENDING), ("scope", ASCENDING)],
+            "name": "application_id_scope_unique",
+            "unique": True,
+        },
+    ],
+    "confessions": [
+        {
+            "keys": [("confession_id", ASCENDING)],
+            "name": "confession_id_unique",
+            "unique": True,
+        },
+        # Serves both the lookups by ID and the newest first pages of a guild's ledger
+        {
+            "keys": [("guild_id", ASCENDING), ("confession_id", DESCENDING)],
+            "name": "guild_id_confession_id",
+        },
+    ],
+}
+
+
+def get_client() -> AsyncIOMotorClient:
+    """Returns the shared MongoDB client, creating it on the first call. The connection pool is configured using the `database` section in `config.json`.
+
+    Returns
+    -------
+    `AsyncIOMotorClient`
+    """
+
+    global _client
+
+    if _client is None:
+        database_config: Mapping[str, Any] = get_config().database
+        options = {
+            option: database_config[key]
+            for key, option in CLIENT_OPTIONS.items()
+            if database_config.get(key) is not None
+        }
+
+        _client = AsyncIOMotorClient(os.getenv("MONGODB_CONNECTION_STRING"), **options)
+
+    return _client
+
 
 def load_database() -> AsyncIOMotorDatabase:
     """Initialises MongoDB Database.
@@ -15,13 +100,14 @@ def load_database() -> AsyncIOMotorDatabase:
     `AsyncIOMotorDatabase`
     """
 
-    cluster = AsyncIOMotorClient(os.getenv("MONGODB_CONNECTION_STRING"))
-    return cluster.get_database("SnapBot_Database")
+    return get_client().get_database("SnapBot_Database")
 
 
 def load_database_and_collection(collection: str) -> AsyncIOMotorCollection:
     """Initialises MongoDB Database and the specified collection. If the collection name provided is not found within the database, this function will create one with that name instead.
 
+    Every call for the same collection returns the same handle, which shares the client's connection pool.
+
     Parameters
     ----------
     collection : `str`
@@ -32,6 +118,91 @@ def load_database_and_collection(collection: str) -> AsyncIOMotorCollection:
     `AsyncIOMotorCollection`
     """
 
-    cluster = AsyncIOMotorClient(os.getenv("MONGODB_CONNECTION_STRING"))
-    database = cluster.get_database("SnapBot_Database")
-    return database.get_collection(collection)
+    if collection not in _collections:
+        _collections[collection] = load_database().get_collection(collection)
+
+    return _collections[collection]
+
+
+def close_database() -> None:
+    """Closes the shared MongoDB client along with its connection pool. A new client will be created if the database is used again afterwards."""
+
+    global _client
+
+    if _client is not None:
+        _client.close()
+        _client = None
+        _collections.clear()
+
+
+def normalize_index_keys(keys: Any) -> Tuple[Tuple[str, Any], ...]:
+    """Returns the key specification of an index in a comparable form. Numeric directions are compared as integers, since the server may report `1` as `1.0`.
+
+    Parameters
+    ----------
+    keys : `Any`
+        The keys of the index, as a sequence of ( field, direction ) pairs.
+
+    Returns
+    -------
+    `Tuple[Tuple[str, Any], ...]`
+    """
+
+    return tuple(
+        (field, int(direction) if isinstance(direction, (int, float)) else direction)
+        for field, direction in keys
+    )
+
+
+async def ensure_indexes() -> None:
+    """Creates the indexes listed in `INDEXES` which don't exist in the database yet. Indexes which already exist on the same keys are left untouched, whatever their name, so this is safe to run on every startup. If such an index has different options, a warning is logged instead."""
+
+    start = time.perf_counter()
+    created: List[str] = []
+
+    for collection, indexes in INDEXES.items():
+        coll = load_database_and_collection(collection)
+
+        try:
+            existing = await coll.index_information()
+
+        except PyMongoError as error:
+            logger.error(f"Couldn't read the indexes of '{collection}': {error}")
+            continue
+
+        # Indexes are matched by their keys rather than their names, since an index on the same keys under another name( e.g. the automatic `user_id_1` ) can't be created again
+        existing_keys = {
+            normalize_index_keys(info["key"]): name for name, info in existing.items()
+        }
+
+        for index in indexes:
+            options = {key: value for key, value in index.items() if key != "keys"}
+            existing_name = existing_keys.get(normalize_index_keys(index["keys"]))
+
+            if existing_name is not None:
+                mismatched = [
+                    option
+                    for option, value in options.items()
+                    if option != "name" and existing[existing_name].get(option) != value
+                ]
+
+                if mismatched:
+                    logger.warning(
+                        f"The index '{existing_name}' on '{collection}' has the keys of '{index['name']}' but different options ({', '.join(mismatched)}). Drop it to have it recreated"
+                    )
+
+                continue
+
+            try:
+                await coll.create_index(index["keys"], **options)
+                created.append(f"{collection}.{index['name']}")
+
+            except PyMongoError as error:
+                logger.error(
+                    f"Couldn't create the index '{index['name']}' on '{collection}': {error}"
+                )
+
+    elapsed = (time.perf_counter() - start) * 1000
+    logger.info(
+        f"Ensured database indexes in {elapsed:.2f}ms (created: {', '.join(created) or 'none'})"
+    )
@@ -1,13 +1,60 @@
+import asyncio
 import os
 import logging
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, List, Optional, Sequence
 
-from cryptography.fernet import Fernet, InvalidToken
+# cryptography is only imported on first use, so that it doesn't slow down the bot's startup
+if TYPE_CHECKING:
+    from cryptography.fernet import Fernet, MultiFernet
 
 logger = logging.getLogger("snapbot")
 
-KEY = os.getenv("ENCRYPTION_KEY").encode()  # Convert the key string to bytes
-fernet = Fernet(KEY)  # Load the fernet using the key
+# The key ring, loaded from the environment on first use
+_fernet: Optional["MultiFernet"] = None
+_primary_fernet: Optional["Fernet"] = None
+
+# A small thread pool which runs the encryption work off the event loop. Created on first use
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def load_keys() -> List[bytes]:
+    """Returns the encryption keys from the environment, newest first.
+
+    The keys are read from `ENCRYPTION_KEYS` as a comma separated list, falling back to the single key in `ENCRYPTION_KEY`. To rotate the key, add the new key to the front of `ENCRYPTION_KEYS` and keep the old ones after it until every stored message has been re-encrypted.
+
+    Returns
+    -------
+    `List[bytes]`
+    """
+
+    keys = os.getenv("ENCRYPTION_KEYS") or os.getenv("ENCRYPTION_KEY") or ""
+    keys = [key.strip().encode() for key in keys.split(",") if key.strip()]
+
+    if not keys:
+        raise RuntimeError("No encryption key was found in the environment.")
+
+    return keys
+
+
+def get_fernet() -> "MultiFernet":
+    """Returns the key ring, which encrypts with the newest key and decrypts with any of the keys.
+
+    Returns
+    -------
+    `MultiFernet`
+    """
+
+    global _fernet, _primary_fernet
+
+    if _fernet is None:
+        from cryptography.fernet import Fernet, MultiFernet
+
+        fernets = [Fernet(key) for key in load_keys()]
+        _primary_fernet = fernets[0]
+        _fernet = MultiFernet(fernets)
+
+    return _fernet
 
 
 def encrypt(message: str) -> str:
@@ -24,7 +71,7 @@ def encrypt(message: str) -> str:
         Encrypted version of the provided message.
     """
 
-    encrypted_message = fernet.encrypt(message.encode()).decode()
+    encrypted_message = get_fernet().encrypt(message.encode()).decode()
     return encrypted_message
 
 
@@ -42,9 +89,166 @@ def decrypt(encrypted_message: str) -> Optional[str]:
         Returns the decrypted message if the decryption is successful. Else, `None`.
     """
 
+    from cryptography.fernet import InvalidToken
+
     try:
-        decrypted_message = fernet.decrypt(encrypted_message)
+        decrypted_message = get_fernet().decrypt(encrypted_message)
     except InvalidToken:
         logger.error("Invalid Encrypted Message was provided.")
         return None
     return decrypted_message.decode()
+
+
+def rotate(encrypted_message: str) -> Optional[str]:
+    """Returns the provided encrypted message re-encrypted with the newest key. Messages which are already encrypted with the newest key are returned unchanged.
+
+    Parameters
+    ----------
+    encrypted_message : `str`
+        The message to re-encrypt.
+
+    Returns
+    -------
+    `Optional[str]`
+        Returns the re-encrypted message if it could be decrypted. Else, `None`.
+    """
+
+    from cryptography.fernet import InvalidToken
+
+    fernet = get_fernet()
+
+    try:
+        _primary_fernet.decrypt(encrypted_message)
+        return encrypted_message
+
+    except InvalidToken:
+        pass
+
+    try:
+        return fernet.rotate(encrypted_message.encode()).decode()
+
+    except InvalidToken:
+        logger.error("Invalid Encrypted Message was provided.")
+        return None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="snapbot-crypto"
+        )
+
+    return _executor
+
+
+def encrypt_many(messages: Sequence[str]) -> List[str]:
+    """Returns the encrypted versions of the provided messages, in the same order.
+
+    Parameters
+    ----------
+    messages : `Sequence[str]`
+        The messages to encrypt.
+
+    Returns
+    -------
+    `List[str]`
+    """
+
+    return [encrypt(message) for message in messages]
+
+
+def decrypt_many(encrypted_messages: Sequence[str]) -> List[Optional[str]]:
+    """Returns the decrypted versions of the provided encrypted messages, in the same order. Messages which can't be decrypted are returned as `None`.
+
+    Parameters
+    ----------
+    encrypted_messages : `Sequence[str]`
+        The messages to decrypt.
+
+    Returns
+    -------
+    `List[Optional[str]]`
+    """
+
+    return [decrypt(message) for message in encrypted_messages]
+
+
+def rotate_many(encrypted_messages: Sequence[str]) -> List[Optional[str]]:
+    """Returns the provided encrypted messages re-encrypted with the newest key, in the same order. See `rotate`.
+
+    Parameters
+    ----------
+    encrypted_messages : `Sequence[str]`
+        The messages to re-encrypt.
+
+    Returns
+    -------
+    `List[Optional[str]]`
+    """
+
+    return [rotate(message) for message in encrypted_messages]
+
+
+async def async_encrypt(message: str) -> str:
+    """Same as `encrypt`, but runs in a background thread so that it doesn't block the event loop."""
+
+    return await asyncio.get_running_loop().run_in_executor(
+        _get_executor(), encrypt, message
+    )
+
+
+async def async_decrypt(encrypted_message: str) -> Optional[str]:
+    """Same as `decrypt`, but runs in a background thread so that it doesn't block the event loop."""
+
+    return await asyncio.get_running_loop().run_in_executor(
+        _get_executor(), decrypt, encrypted_message
+    )
+
+
+async def async_encrypt_many(messages: Sequence[str]) -> List[str]:
+    """Same as `encrypt_many`, but runs in a background thread so that it doesn't block the event loop. The whole batch is handled by a single thread."""
+
+    return await asyncio.get_running_loop().run_in_executor(
+        _get_executor(), encrypt_many, list(messages)
+    )
+
+
+async def async_decrypt_many(encrypted_messages: Sequence[str]) -> List[Optional[str]]:
+    """Same as `decrypt_many`, but runs in a background thread so that it doesn't block the event loop. The whole batch is handled by a single thread."""
+
+    return await asyncio.get_running_loop().run_in_executor(
+        _get_executor(), decrypt_many, list(encrypted_messages)
+    )
+
+
+async def async_rotate_many(
+    encrypted_messages: Sequence[str],
+) -> List[Optional[str]]:
+    """Same as `rotate_many`, but runs in a background thread so that it doesn't block the event loop. The whole batch is handled by a single thread."""
+
+    return await asyncio.get_running_loop().run_in_executor(
+        _get_executor(), rotate_many, list(encrypted_messages)
+    )
+
+
+def shutdown_executor() -> None:
+    """Shuts down the thread pool used for encryption, waiting for any pending work to finish."""
+
+    global _executor
+
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+
+
+async def async_shutdown_executor() -> None:
+    """Same as `shutdown_executor`, but waits for the pending work in a background thread so that it doesn't block the event loop. Work submitted meanwhile goes to a new thread pool."""
+
+    global _executor
+
+    executor, _executor = _executor, None
+
+    if executor is not None:
+        await asyncio.to_thread(executor.shutdown, wait=True)
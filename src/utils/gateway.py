@@ -0,0 +1,155 @@
+import ast
+import importlib.util
+import logging
+from typing import Any, Dict, Iterable, Mapping, Set, Tuple
+
+from discord import Intents, MemberCacheFlags
+
+logger = logging.getLogger("snapbot")
+
+
+def read_declared_intents(extension: str) -> Tuple[str, ...]:
+    """Returns the intents an extension declares in its module level `INTENTS` tuple, read from its source without executing it. Returns an empty tuple if the extension doesn't declare any.
+
+    The extension is only executed once, when it's loaded into the bot, but the intents are needed before the bot is created.
+
+    Parameters
+    ----------
+    extension : `str`
+        The name of the extension, e.g. `cogs.afk`.
+
+    Returns
+    -------
+    `Tuple[str, ...]`
+    """
+
+    spec = importlib.util.find_spec(extension)
+
+    if spec is None or spec.origin is None:
+        raise ValueError(f"Extension '{extension}' could not be found.")
+
+    with open(spec.origin, encoding="utf-8") as file:
+        tree = ast.parse(file.read(), filename=spec.origin)
+
+    for node in tree.body:
+        if (
+            isinstance(node, ast.Assign)
+            and len(node.targets) == 1
+            and isinstance(node.targets[0], ast.Name)
+            and node.targets[0].id == "INTENTS"
+        ):
+            # Must be a literal, since nothing else in the module is available without executing it
+            return tuple(ast.literal_eval(node.value))
+
+    return ()
+
+
+def get_required_intents(extensions: Iterable[str]) -> Set[str]:
+    """Returns the names of the intents declared by the provided extensions. Each extension declares the intents it needs in a module level `INTENTS` tuple of string literals.
+
+    Parameters
+    ----------
+    extensions : `Iterable[str]`
+        The names of the extensions.
+
+    Returns
+    -------
+    `Set[str]`
+    """
+
+    required: Set[str] = set()
+
+    for extension in extensions:
+        required.update(read_declared_intents(extension))
+
+    return required
+
+
+def build_intents(names: Iterable[str]) -> Intents:
+    """Returns the intents with only the specified flags enabled.
+
+    Parameters
+    ----------
+    names : `Iterable[str]`
+        The names of the flags to enable, e.g. `guild_messages`.
+
+    Returns
+    -------
+    `Intents`
+    """
+
+    intents = Intents.none()
+
+    for name in names:
+        if name not in Intents.VALID_FLAGS:
+            raise ValueError(f"'{name}' is not a valid intent.")
+
+        setattr(intents, name, True)
+
+    return intents
+
+
+def build_member_cache_flags(names: Iterable[str]) -> MemberCacheFlags:
+    """Returns the member cache flags with only the specified flags enabled.
+
+    Parameters
+    ----------
+    names : `Iterable[str]`
+        The names of the flags to enable, e.g. `joined`.
+
+    Returns
+    -------
+    `MemberCacheFlags`
+    """
+
+    flags = MemberCacheFlags.none()
+
+    for name in names:
+        if name not in MemberCacheFlags.VALID_FLAGS:
+            raise ValueError(f"'{name}' is not a valid member cache flag.")
+
+        setattr(flags, name, True)
+
+    return flags
+
+
+def get_gateway_options(
+    config: Mapping[str, Any], extensions: Iterable[str]
+) -> Dict[str, Any]:
+    """Returns the intents and cache options the bot should be created with, according to the `gateway` section in `config.json`.
+
+    With the `trimmed` profile, only the intents listed in the config and the ones declared by the extensions are enabled, and members are only cached as configured. With the `all` profile, every intent is enabled and every member is cached, like before the profiles existed.
+
+    Parameters
+    ----------
+    config : `Mapping[str, Any]`
+        The `gateway` section of the configuration.
+
+    extensions : `Iterable[str]`
+        The names of the extensions which will be loaded.
+
+    Returns
+    -------
+    `Dict[str, Any]`
+        The keyword arguments for `SnapBot`.
+    """
+
+    if config["profile"] == "all":
+        intents = Intents.all()
+
+        return {
+            "intents": intents,
+            "member_cache_flags": MemberCacheFlags.from_intents(intents),
+            "chunk_guilds_at_startup": True,
+            "max_messages": config["max_messages"],
+        }
+
+    names = set(config["intents"]) | get_required_intents(extensions)
+    logger.info(f"Enabled intents: {', '.join(sorted(names))}")
+
+    return {
+        "intents": build_intents(names),
+        "member_cache_flags": build_member_cache_flags(config["member_cache"]),
+        "chunk_guilds_at_startup": config["chunk_guilds_at_startup"],
+        "max_messages": config["max_messages"],
+    }
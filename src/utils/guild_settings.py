@@ -0,0 +1,162 @@
+import logging
+from typing import Any, Dict, Iterable, Optional
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ReturnDocument
+
+from utils.db_handler import load_database_and_collection
+from utils.metrics import Gauge
+from utils.timings import timed
+
+logger = logging.getLogger("snapbot")
+
+
+class GuildSettingsStore:
+    """Per-guild settings( like the configured channels and the owner ) stored in the `guild_settings` collection, with an in-memory cache in front of it.
+
+    The cache is warmed for every guild the bot is in, so reads never touch the database. Every update replaces the guild's cached settings with a new `dict`, so anything derived from a guild's settings can detect a change by comparing the object's identity.
+
+    Parameters
+    ----------
+    coll : `AsyncIOMotorCollection`
+        The collection holding the guild settings.
+    """
+
+    def __init__(self, coll: AsyncIOMotorCollection) -> None:
+        self.coll = coll
+        self.settings: Dict[int, dict] = {}
+
+    async def load(self, guild_ids: Iterable[int]) -> None:
+        """Loads the settings of the specified guilds into memory using a single query.
+
+        Parameters
+        ----------
+        guild_ids : `Iterable[int]`
+            The IDs of the guilds.
+        """
+
+        guild_ids = list(guild_ids)
+
+        if not guild_ids:
+            return
+
+        # Guilds without any settings are cached as well, so they don't have to be queried again
+        loaded: Dict[int, dict] = {guild_id: {} for guild_id in guild_ids}
+
+        async for data in self.coll.find({"guild_id": {"$in": guild_ids}}):
+            loaded[data["guild_id"]] = data
+
+        self.settings.update(loaded)
+        logger.info(f"Loaded the settings of {len(loaded)} guild(s) into memory")
+
+    def get(self, guild_id: int) -> Optional[dict]:
+        """Returns the cached settings of the specified guild. Returns `None` if the guild's settings aren't loaded.
+
+        Parameters
+        ----------
+        guild_id : `int`
+            The ID of the guild.
+
+        Returns
+        -------
+        `Optional[dict]`
+        """
+
+        return self.settings.get(guild_id)
+
+    def get_value(self, guild_id: int, key: str, default: Any = None) -> Any:
+        """Returns a single setting of the specified guild. Nested settings can be accessed using dots, such as `channels.log`. Returns `default` if the setting isn't set.
+
+        Parameters
+        ----------
+        guild_id : `int`
+            The ID of the guild.
+
+        key : `str`
+            The name of the setting.
+
+        default : `Any`
+            The value to return if the setting isn't set. Defaults to `None`.
+
+        Returns
+        -------
+        `Any`
+        """
+
+        value: Any = self.settings.get(guild_id)
+
+        for part in key.split("."):
+            if not isinstance(value, dict) or part not in value:
+                return default
+
+            value = value[part]
+
+        return value
+
+    async def update(
+        self,
+        guild_id: int,
+        *,
+        set_fields: Optional[Dict[str, Any]] = None,
+        unset_fields: Optional[Iterable[str]] = None,
+    ) -> dict:
+        """Sets and/or unsets settings of the specified guild in a single database operation, and replaces the guild's cached settings with the updated ones.
+
+        Parameters
+        ----------
+        guild_id : `int`
+            The ID of the guild.
+
+        set_fields : `Optional[Dict[str, Any]]`
+            The settings to set, mapped to their new values. Nested settings can be set using dots, such as `channels.log`. Defaults to `None`.
+
+        unset_fields : `Optional[Iterable[str]]`
+            The names of the settings to remove. Defaults to `None`.
+
+        Returns
+        -------
+        `dict`
+            The updated settings of the guild.
+        """
+
+        update: Dict[str, dict] = {}
+
+        if set_fields:
+            update["$set"] = dict(set_fields)
+
+        if unset_fields:
+            update["$unset"] = {field: "" for field in unset_fields}
+
+        if not update:
+            raise ValueError("At least one setting must be set or unset.")
+
+        with timed("db"):
+            data: dict = await self.coll.find_one_and_update(
+                {"guild_id": guild_id},
+                update,
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+
+        self.settings[guild_id] = data
+        return data
+
+    def invalidate(self, guild_id: int) -> None:
+        """Removes the cached settings of the specified guild.
+
+        Parameters
+        ----------
+        guild_id : `int`
+            The ID of the guild.
+        """
+
+        self.settings.pop(guild_id, None)
+
+
+guild_settings = GuildSettingsStore(load_database_and_collection("guild_settings"))
+
+Gauge(
+    "guild_settings_cached",
+    "Number of guilds whose settings are held in memory",
+    function=lambda: len(guild_settings.settings),
+)
@@ -1,13 +1,12 @@
-from typing import Dict, Optional
+from typing import Optional
 
-import discord
 from discord import Interaction, TextChannel
 
-from utils.cfg_handler import load_config
+from utils.channel_resolver import channel_resolver
 
 
 def get_channel(interaction: Interaction, /, *, channel: str) -> Optional[TextChannel]:
-    """Returns the specified discord server channel. Returns `None` if the channel is not found.
+    """Returns the specified discord server channel as configured for the interaction's guild. Returns `None` if the channel is not found.
 
     Parameters
     ----------
@@ -23,14 +22,5 @@ def get_channel(interaction: Interaction, /, *, channel: str) -> Optional[TextCh
     `Optional[TextChannel]`
     """
 
-    config_data = load_config()
-    channels_data: Dict[str, int] = config_data["server_settings"]["channels"]
-
-    if channels_data.get(channel.lower()) is None:
-        return None
-
-    else:
-        return discord.utils.find(
-            lambda c: c.id == channels_data.get(channel.lower()),
-            interaction.guild.channels,
-        )
+    # Resolved through the channel IDs and cached per guild, instead of scanning every channel in the guild
+    return channel_resolver.resolve(interaction.guild, channel)
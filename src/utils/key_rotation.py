@@ -0,0 +1,158 @@
+import asyncio
+import json
+import logging
+import os
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from utils.encryption import async_rotate_many
+
+logger = logging.getLogger("snapbot")
+
+
+class Checkpoint:
+    """Keeps track of the progress of a re-encryption run in a JSON file, so that an interrupted run can be resumed where it stopped.
+
+    The checkpoint records the source it tracks, since the IDs of different sources( e.g. message IDs and confession IDs ) can't be compared. Resuming from the checkpoint of another source raises a `ValueError`, rather than skipping every record.
+
+    Parameters
+    ----------
+    path : `str`
+        The path of the checkpoint file.
+
+    source : `str`
+        The source of the records being re-encrypted, e.g. `ledger` or `channel:<id>`.
+    """
+
+    def __init__(self, path: str, *, source: str) -> None:
+        self.path = path
+        self.data: Dict[str, Any] = {
+            "source": source,
+            "last_id": None,
+            "processed": 0,
+            "rotated": 0,
+            "invalid": 0,
+        }
+
+        if os.path.exists(path):
+            with open(path, "r") as file:
+                saved: Dict[str, Any] = json.load(file)
+
+            if saved.get("source") != source and (
+                "source" in saved or saved.get("last_id") is not None
+            ):
+                raise ValueError(
+                    f"The checkpoint '{path}' was written for '{saved.get('source', 'an unknown source')}', not '{source}'. Use another checkpoint file."
+                )
+
+            self.data.update(saved)
+            self.data["source"] = source
+
+    @property
+    def last_id(self) -> Optional[int]:
+        """The ID of the last record which was processed. `None` if nothing was processed yet."""
+
+        return self.data["last_id"]
+
+    def save(self) -> None:
+        """Writes the progress to the checkpoint file, replacing it atomically."""
+
+        temp_path = f"{self.path}.tmp"
+
+        with open(temp_path, "w") as file:
+            json.dump(self.data, file, indent=4)
+
+        os.replace(temp_path, self.path)
+
+
+async def reencrypt_records(
+    records: AsyncIterator[Any],
+    *,
+    get_id: Callable[[Any], int],
+    get_token: Callable[[Any], str],
+    save: Callable[[Any, str], Awaitable[None]],
+    checkpoint: Checkpoint,
+    chunk_size: int = 100,
+    concurrency: int = 5,
+) -> Dict[str, Any]:
+    """Re-encrypts the encrypted tokens of the provided records with the newest encryption key.
+
+    The records are streamed in chunks. The tokens of each chunk are re-encrypted together in a background thread, and the updated records are saved in parallel. Progress is written to the checkpoint after every chunk. The records should be ordered by ID, and start after the checkpoint's `last_id` when resuming.
+
+    Parameters
+    ----------
+    records : `AsyncIterator[Any]`
+        The records to re-encrypt.
+
+    get_id : `Callable[[Any], int]`
+        A function which returns the ID of a record.
+
+    get_token : `Callable[[Any], str]`
+        A function which returns the encrypted token stored in a record.
+
+    save : `Callable[[Any, str], Awaitable[None]]`
+        A coroutine function which stores the re-encrypted token in a record.
+
+    checkpoint : `Checkpoint`
+        The checkpoint to record the progress in.
+
+    chunk_size : `int`
+        The number of records processed at a time. Defaults to `100`.
+
+    concurrency : `int`
+        The maximum number of records saved at the same time. Defaults to `5`.
+
+    Returns
+    -------
+    `Dict[str, Any]`
+        The progress of the whole run, including any previous runs resumed from the checkpoint.
+    """
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def save_record(record: Any, token: str) -> None:
+        async with semaphore:
+            await save(record, token)
+
+    async def process(chunk: List[Any]) -> None:
+        tokens = [get_token(record) for record in chunk]
+        rotated_tokens = await async_rotate_many(tokens)
+
+        pending = []
+
+        for record, token, rotated_token in zip(chunk, tokens, rotated_tokens):
+            if rotated_token is None:
+                checkpoint.data["invalid"] += 1
+                logger.error(
+                    f"Couldn't decrypt the token of the record {get_id(record)}"
+                )
+
+            # Tokens already encrypted with the newest key are returned unchanged and don't need saving
+            elif rotated_token != token:
+                pending.append(save_record(record, rotated_token))
+
+        await asyncio.gather(*pending)
+
+        checkpoint.data["rotated"] += len(pending)
+        checkpoint.data["processed"] += len(chunk)
+        checkpoint.data["last_id"] = get_id(chunk[-1])
+        checkpoint.save()
+
+        logger.info(
+            "Re-encryption progress: {processed} processed, {rotated} rotated, {invalid} invalid".format(
+                **checkpoint.data
+            )
+        )
+
+    chunk: List[Any] = []
+
+    async for record in records:
+        chunk.append(record)
+
+        if len(chunk) >= chunk_size:
+            await process(chunk)
+            chunk = []
+
+    if chunk:
+        await process(chunk)
+
+    return dict(checkpoint.data)
@@ -0,0 +1,224 @@
+import atexit
+import json
+import logging
+import logging.config
+import queue
+import time
+from datetime import datetime
+from logging.handlers import (
+    QueueHandler,
+    QueueListener,
+    RotatingFileHandler,
+    TimedRotatingFileHandler,
+)
+from typing import Any, Dict, List
+
+# The background listeners which write the queued records, one for each queued logger
+_listeners: List[QueueListener] = []
+
+
+class JSONFormatter(logging.Formatter):
+    """Formats every record as a single line of JSON, for analysing the logs with other tools.
+
+    Along with the standard fields, every extra field passed to the logger( e.g. `logger.info(..., extra={"guild_id": ...})` ) is included as a key of its own.
+    """
+
+    # Attributes which every record has, so they aren't extra fields
+    RESERVED_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+    def format(self, record: logging.LogRecord) -> str:
+        data: Dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(record.created).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "file": record.filename,
+            "line": record.lineno,
+        }
+
+        data.update(
+            {
+                key: value
+                for key, value in vars(record).items()
+                if key not in self.RESERVED_ATTRIBUTES
+            }
+        )
+
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+
+        return json.dumps(data, default=str)
+
+
+class BatchedFlushMixin:
+    """Makes a stream handler flush its stream in batches instead of after every record.
+
+    The stream is flushed once `flush_every` records are waiting, once `flush_interval` seconds have passed since the last flush, or as soon as a record at or above `flush_level` is written, so errors always reach the disk straight away.
+    """
+
+    def setup_batching(
+        self, *, flush_every: int, flush_interval: float, flush_level: int | str
+    ) -> None:
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.flush_level = logging._checkLevel(flush_level)
+
+        self.pending = 0
+        self.last_flush = time.monotonic()
+        self.deferring = False
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # `StreamHandler.emit` flushes after every write, which is only let through for urgent records
+        self.deferring = record.levelno < self.flush_level
+
+        try:
+            super().emit(record)
+
+        finally:
+            self.deferring = False
+
+    def flush(self) -> None:
+        if self.deferring:
+            self.pending += 1
+
+            if (
+                self.pending < self.flush_every
+                and time.monotonic() - self.last_flush < self.flush_interval
+            ):
+                return
+
+        super().flush()
+
+        self.pending = 0
+        self.last_flush = time.monotonic()
+
+
+class BatchedRotatingFileHandler(BatchedFlushMixin, RotatingFileHandler):
+    """A `RotatingFileHandler` which rotates the file once it reaches `maxBytes`, and flushes it in batches. See `BatchedFlushMixin`.
+
+    Parameters
+    ----------
+    flush_every : `int`
+        The number of records written before the file is flushed. Defaults to `50`.
+
+    flush_interval : `float`
+        The maximum number of seconds a record waits before the file is flushed. Defaults to `1`.
+
+    flush_level : `int | str`
+        Records at or above this level are flushed straight away. Defaults to `ERROR`.
+
+    The remaining arguments are passed to `RotatingFileHandler`.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        flush_every: int = 50,
+        flush_interval: float = 1.0,
+        flush_level: int | str = logging.ERROR,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.setup_batching(
+            flush_every=flush_every,
+            flush_interval=flush_interval,
+            flush_level=flush_level,
+        )
+
+
+class BatchedTimedRotatingFileHandler(BatchedFlushMixin, TimedRotatingFileHandler):
+    """A `TimedRotatingFileHandler` which rotates the file at the configured interval, and flushes it in batches. Takes the same batching arguments as `BatchedRotatingFileHandler`, with the remaining arguments being passed to `TimedRotatingFileHandler`."""
+
+    def __init__(
+        self,
+        *args: Any,
+        flush_every: int = 50,
+        flush_interval: float = 1.0,
+        flush_level: int | str = logging.ERROR,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.setup_batching(
+            flush_every=flush_every,
+            flush_interval=flush_interval,
+            flush_level=flush_level,
+        )
+
+
+class FlushingQueueListener(QueueListener):
+    """A `QueueListener` which flushes its handlers whenever the queue has been idle for `flush_interval` seconds, so batched records don't wait for the next record to reach the disk."""
+
+    def __init__(
+        self, log_queue: queue.Queue, *handlers: logging.Handler, flush_interval: float
+    ) -> None:
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.flush_interval = flush_interval
+
+    def dequeue(self, block: bool) -> logging.LogRecord:
+        if not block:
+            return self.queue.get_nowait()
+
+        while True:
+            try:
+                return self.queue.get(timeout=self.flush_interval)
+
+            except queue.Empty:
+                for handler in self.handlers:
+                    handler.flush()
+
+
+def configure_logging(config: Dict[str, Any]) -> None:
+    """Configures logging using the provided `dictConfig` data, and moves the handlers of the loggers listed in its `queue` section behind a queue.
+
+    The queued loggers only put their records on the queue, while a background thread writes them using the configured handlers, so logging never blocks the event loop on disk writes. The `queue` section supports the following keys:
+
+    - `loggers`: The names of the loggers to queue.
+    - `flush_interval`: The number of seconds the queue can be idle before the handlers are flushed. Defaults to `1`.
+
+    Parameters
+    ----------
+    config : `Dict[str, Any]`
+        The logging configuration, as in the `logging` section of `config.json`.
+    """
+
+    config = dict(config)
+    queue_config: Dict[str, Any] = config.pop("queue", {})
+
+    logging.config.dictConfig(config)
+
+    for name in queue_config.get("loggers", []):
+        logger = logging.getLogger(name)
+        handlers = list(logger.handlers)
+
+        if not handlers:
+            continue
+
+        log_queue: queue.Queue = queue.Queue()
+
+        for handler in handlers:
+            logger.removeHandler(handler)
+
+        logger.addHandler(QueueHandler(log_queue))
+
+        listener = FlushingQueueListener(
+            log_queue,
+            *handlers,
+            flush_interval=queue_config.get("flush_interval", 1.0),
+        )
+        listener.start()
+        _listeners.append(listener)
+
+
+def shutdown_logging() -> None:
+    """Stops the background listeners after writing every record left in their queues, then flushes their handlers. Safe to call more than once."""
+
+    while _listeners:
+        listener = _listeners.pop()
+        listener.stop()
+
+        for handler in listener.handlers:
+            handler.flush()
+
+
+# Runs before `logging.shutdown`, which was registered earlier, so the queues are drained before the handlers are closed
+atexit.register(shutdown_logging)
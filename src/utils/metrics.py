@@ -0,0 +1,382 @@
+import bisect
+import math
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import (
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+# Upper bounds( in seconds ) of the default histogram buckets
+DEFAULT_BUCKETS: Sequence[float] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# The values of a metric's labels, in the same order as its label names
+LabelValues = Tuple[str, ...]
+
+# The value of every series of a metric, by label values
+SeriesValues = Mapping[LabelValues, float]
+
+# Every metric created so far, by name. Creating a metric with an existing name replaces the old one
+_registry: Dict[str, "Metric"] = {}
+
+
+class Metric:
+    """The base class of every metric. Metrics register themselves on creation, so that `render_metrics` can include them.
+
+    Parameters
+    ----------
+    name : `str`
+        The name of the metric.
+
+    description : `str`
+        What the metric measures.
+
+    labels : `Sequence[str]`
+        The names of the labels which split the metric into separate series, e.g. one series per command. Defaults to no labels.
+    """
+
+    type = "untyped"
+
+    def __init__(
+        self, name: str, description: str, *, labels: Sequence[str] = ()
+    ) -> None:
+        self.name = name
+        self.description = description
+        self.label_names: LabelValues = tuple(labels)
+
+        _registry[name] = self
+
+    def samples(self) -> Iterator[Tuple[str, LabelValues, float]]:
+        """Yields the current samples of the metric, as the suffix of the sample's name, its label values and its value."""
+
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """Returns the metric in the Prometheus text format.
+
+        Returns
+        -------
+        `str`
+        """
+
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+
+        for suffix, label_values, value in self.samples():
+            lines.append(
+                f"{self.name}{suffix}{self.format_labels(label_values)} {format_value(value)}"
+            )
+
+        return "\n".join(lines)
+
+    def format_labels(self, label_values: LabelValues) -> str:
+        if not label_values:
+            return ""
+
+        labels = ",".join(
+            f'{name}="{escape_label(str(value))}"'
+            for name, value in zip(self.label_names, label_values)
+        )
+        return f"{{{labels}}}"
+
+
+class Counter(Metric):
+    """Counts how many times something happened, e.g. how many commands were run. Only ever goes up.
+
+    The count is either incremented explicitly, or read from `function` whenever the metrics are rendered, for things which already keep their own counts.
+
+    Parameters
+    ----------
+    function : `Optional[Callable[[], SeriesValues]]`
+        A function which returns the current count of every series, by label values. Defaults to `None`.
+
+    The remaining parameters are the same as `Metric`.
+    """
+
+    type = "counter"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        *,
+        labels: Sequence[str] = (),
+        function: Optional[Callable[[], SeriesValues]] = None,
+    ) -> None:
+        super().__init__(name, description, labels=labels)
+        self.function = function
+        self.values: Dict[LabelValues, float] = defaultdict(float)
+
+        # Counters without labels are reported as zero before their first increment
+        if not self.label_names:
+            self.values[()] = 0.0
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        """Increments the counter.
+
+        Parameters
+        ----------
+        *label_values : `str`
+            The values of the counter's labels, in order.
+
+        amount : `float`
+            The amount to increment by. Defaults to `1`.
+        """
+
+        self.values[label_values] += amount
+
+    def samples(self) -> Iterator[Tuple[str, LabelValues, float]]:
+        values = self.values if self.function is None else self.function()
+
+        for label_values, value in values.items():
+            yield "", label_values, value
+
+
+class Gauge(Metric):
+    """Holds a value which can go up and down, e.g. the number of cached entries.
+
+    The value is either set explicitly, or read from `function` whenever the metrics are rendered, which costs nothing until then.
+
+    Parameters
+    ----------
+    function : `Optional[Callable[[], Union[float, SeriesValues]]]`
+        A function which returns the current value. Gauges with labels return the value of every series instead, by label values. Defaults to `None`.
+
+    The remaining parameters are the same as `Metric`.
+    """
+
+    type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        *,
+        labels: Sequence[str] = (),
+        function: Optional[Callable[[], Union[float, SeriesValues]]] = None,
+    ) -> None:
+        super().__init__(name, description, labels=labels)
+        self.function = function
+        self.values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, *label_values: str) -> None:
+        """Sets the value of the gauge.
+
+        Parameters
+        ----------
+        value : `float`
+            The new value.
+
+        *label_values : `str`
+            The values of the gauge's labels, in order.
+        """
+
+        self.values[label_values] = value
+
+    def samples(self) -> Iterator[Tuple[str, LabelValues, float]]:
+        if self.function is not None and not self.label_names:
+            yield "", (), self.function()
+            return
+
+        values = self.values if self.function is None else self.function()
+
+        for label_values, value in values.items():
+            yield "", label_values, value
+
+
+class HistogramSeries:
+    """The bucket counts of a single series of a `Histogram`."""
+
+    __slots__ = ("counts", "count", "sum")
+
+    def __init__(self, size: int) -> None:
+        self.counts: List[int] = [0] * size
+        self.count = 0
+        self.sum = 0.0
+
+
+class Histogram(Metric):
+    """Counts observed values( like latencies ) into buckets, so that their distribution can be inspected.
+
+    Parameters
+    ----------
+    name : `str`
+        The name of the histogram.
+
+    description : `str`
+        What the histogram measures.
+
+    buckets : `Sequence[float]`
+        The upper bounds of the buckets, in increasing order. Defaults to `DEFAULT_BUCKETS`.
+
+    labels : `Sequence[str]`
+        The names of the labels which split the histogram into separate series. Defaults to no labels.
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        *,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        labels: Sequence[str] = (),
+    ) -> None:
+        super().__init__(name, description, labels=labels)
+        self.buckets: List[float] = sorted(buckets)
+        self.series: Dict[LabelValues, HistogramSeries] = {}
+
+    def get_series(self, label_values: LabelValues) -> HistogramSeries:
+        series = self.series.get(label_values)
+
+        if series is None:
+            # One count per bucket, plus one for the values above the largest bucket
+            series = self.series[label_values] = HistogramSeries(len(self.buckets) + 1)
+
+        return series
+
+    @property
+    def count(self) -> int:
+        """The number of observed values, across every series."""
+
+        return sum(series.count for series in self.series.values())
+
+    @property
+    def sum(self) -> float:
+        """The sum of the observed values, across every series."""
+
+        return sum(series.sum for series in self.series.values())
+
+    def observe(self, value: float, *label_values: str) -> None:
+        """Records an observed value.
+
+        Parameters
+        ----------
+        value : `float`
+            The observed value.
+
+        *label_values : `str`
+            The values of the histogram's labels, in order.
+        """
+
+        series = self.get_series(label_values)
+        series.counts[bisect.bisect_left(self.buckets, value)] += 1
+        series.count += 1
+        series.sum += value
+
+    @contextmanager
+    def time(self, *label_values: str) -> Iterator[None]:
+        """A context manager which records the number of seconds spent inside it.
+
+        Parameters
+        ----------
+        *label_values : `str`
+            The values of the histogram's labels, in order.
+        """
+
+        start = time.perf_counter()
+
+        try:
+            yield
+
+        finally:
+            self.observe(time.perf_counter() - start, *label_values)
+
+    def cumulative_counts(self, *label_values: str) -> Dict[str, int]:
+        """Returns the number of observed values less than or equal to each bucket's upper bound.
+
+        Parameters
+        ----------
+        *label_values : `str`
+            The values of the histogram's labels, in order.
+
+        Returns
+        -------
+        `Dict[str, int]`
+        """
+
+        counts: Dict[str, int] = {}
+        total = 0
+
+        series = self.series.get(label_values) or HistogramSeries(len(self.buckets) + 1)
+
+        for bound, count in zip([*self.buckets, math.inf], series.counts):
+            total += count
+            counts[format_value(bound)] = total
+
+        return counts
+
+    def samples(self) -> Iterator[Tuple[str, LabelValues, float]]:
+        # The bucket's bound is rendered as the extra `le` label
+        for label_values, series in self.series.items():
+            for bound, count in self.cumulative_counts(*label_values).items():
+                yield "_bucket", (*label_values, bound), count
+
+            yield "_sum", label_values, series.sum
+            yield "_count", label_values, series.count
+
+    def format_labels(self, label_values: LabelValues) -> str:
+        if len(label_values) > len(self.label_names):
+            names = (*self.label_names, "le")
+            labels = ",".join(
+                f'{name}="{escape_label(str(value))}"'
+                for name, value in zip(names, label_values)
+            )
+            return f"{{{labels}}}"
+
+        return super().format_labels(label_values)
+
+
+def escape_label(value: str) -> str:
+    """Escapes a label value for the Prometheus text format."""
+
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_value(value: float) -> str:
+    """Formats a sample value for the Prometheus text format."""
+
+    if math.isnan(value):
+        return "NaN"
+
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+
+    if value == int(value):
+        return str(int(value))
+
+    return repr(value)
+
+
+def render_metrics() -> str:
+    """Returns every registered metric in the Prometheus text format.
+
+    Returns
+    -------
+    `str`
+    """
+
+    return "\n".join(metric.render() for metric in _registry.values()) + "\n"
@@ -0,0 +1,118 @@
+import asyncio
+import logging
+import os
+from typing import Optional
+
+from aiohttp import web
+
+from utils.metrics import render_metrics
+
+logger = logging.getLogger("snapbot")
+
+
+class MetricsExporter:
+    """Exposes the registered metrics in the Prometheus text format, on a local HTTP endpoint and/or by dumping them to a file periodically.
+
+    Parameters
+    ----------
+    host : `str`
+        The address the endpoint listens on. Defaults to `127.0.0.1`, so the metrics are only reachable from the same machine.
+
+    port : `Optional[int]`
+        The port the endpoint listens on. The endpoint is disabled if `None`. Defaults to `None`.
+
+    dump_path : `Optional[str]`
+        The path of the file the metrics are dumped to. Dumping is disabled if `None`. Defaults to `None`.
+
+    dump_interval : `float`
+        The number of seconds between two dumps. Defaults to `60`.
+    """
+
+    def __init__(
+        self,
+        *,
+        host: str = "127.0.0.1",
+        port: Optional[int] = None,
+        dump_path: Optional[str] = None,
+        dump_interval: float = 60.0,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.dump_path = dump_path
+        self.dump_interval = dump_interval
+
+        self.runner: Optional[web.AppRunner] = None
+        self.dump_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Starts the endpoint and the periodic dump, whichever are enabled. If the endpoint can't listen on its port, an error is logged and the bot runs without it."""
+
+        if self.port is not None and self.runner is None:
+            app = web.Application()
+            app.router.add_get("/metrics", self.handle_metrics)
+
+            self.runner = web.AppRunner(app, access_log=None)
+            await self.runner.setup()
+
+            # The metrics are optional, so a port which is already taken mustn't stop the bot from starting
+            try:
+                await web.TCPSite(self.runner, self.host, self.port).start()
+
+            except OSError as error:
+                logger.error(
+                    f"Couldn't serve metrics on {self.host}:{self.port}: {error}"
+                )
+                await self.runner.cleanup()
+                self.runner = None
+
+            else:
+                logger.info(
+                    f"Serving metrics on http://{self.host}:{self.port}/metrics"
+                )
+
+        if self.dump_path is not None and self.dump_task is None:
+            self.dump_task = asyncio.create_task(self.dump_periodically())
+
+    async def close(self) -> None:
+        """Stops the endpoint and the periodic dump, dumping the metrics one last time."""
+
+        if self.runner is not None:
+            await self.runner.cleanup()
+            self.runner = None
+
+        if self.dump_task is not None:
+            self.dump_task.cancel()
+            self.dump_task = None
+
+            await self.dump()
+
+    async def handle_metrics(self, request: web.Request) -> web.Response:
+        return web.Response(
+            text=render_metrics(), content_type="text/plain", charset="utf-8"
+        )
+
+    async def dump(self) -> None:
+        """Writes the metrics to `dump_path`, replacing the file atomically. The file is written in a background thread, so the event loop isn't blocked by the disk."""
+
+        # Rendered on the event loop, so the metrics aren't read while they're being updated
+        text = render_metrics()
+
+        try:
+            await asyncio.to_thread(write_file, self.dump_path, text)
+
+        except OSError as error:
+            logger.error(f"Couldn't dump the metrics to {self.dump_path}: {error}")
+
+    async def dump_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.dump_interval)
+            await self.dump()
+
+
+def write_file(path: str, text: str) -> None:
+    temp_path = f"{path}.tmp"
+
+    with open(temp_path, "w") as file:
+        file.write(text)
+
+    os.replace(temp_path, path)
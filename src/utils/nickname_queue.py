@@ -0,0 +1,225 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import aiohttp
+import discord
+from discord import Member
+
+from utils.cfg_handler import get_config
+from utils.metrics import Counter, Gauge
+
+logger = logging.getLogger("snapbot")
+
+NICKNAME_EDITS = Counter(
+    "nickname_edits_total",
+    "Number of queued nickname edits, by outcome",
+    labels=("status",),
+)
+NICKNAME_RETRIES = Counter(
+    "nickname_edit_retries_total",
+    "Number of nickname edits retried after a rate limit or a server error",
+)
+
+
+class TokenBucket:
+    """Limits how often something can happen, while allowing short bursts.
+
+    Parameters
+    ----------
+    rate : `float`
+        The number of tokens added every second.
+
+    capacity : `int`
+        The maximum number of tokens, i.e. the largest burst.
+    """
+
+    def __init__(self, *, rate: float, capacity: int) -> None:
+        self.rate = rate
+        self.capacity = capacity
+
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.tokens + (now - self.updated) * self.rate, self.capacity)
+        self.updated = now
+
+    async def acquire(self) -> None:
+        """Takes a token, waiting until one is available."""
+
+        self.refill()
+
+        while self.tokens < 1:
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+            self.refill()
+
+        self.tokens -= 1
+
+
+class NicknameQueue:
+    """Applies nickname edits in the background, so that replies don't wait for them.
+
+    Each guild has its own queue and token bucket, so a burst of edits in one guild stays within Discord's per-guild rate limit without holding up the other guilds. If a member's nickname is queued again before the earlier edit was applied, only the latest nickname is applied. Edits which fail because of a rate limit or a server error are retried.
+
+    Parameters
+    ----------
+    rate : `float`
+        The number of nickname edits per second allowed in a single guild.
+
+    burst : `int`
+        The number of nickname edits that can be made at once in a single guild.
+
+    max_retries : `int`
+        The maximum number of times a failed edit is retried.
+
+    retry_delay : `float`
+        The number of seconds to wait before the first retry, doubled for every retry after it.
+    """
+
+    def __init__(
+        self, *, rate: float, burst: int, max_retries: int, retry_delay: float
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+
+        # The pending nickname of each member, by guild. `None` removes the nickname
+        self.pending: Dict[int, OrderedDict[int, Tuple[Member, Optional[str]]]] = {}
+        self.workers: Dict[int, asyncio.Task] = {}
+        self.buckets: Dict[int, TokenBucket] = {}
+
+    def __len__(self) -> int:
+        return sum(len(edits) for edits in self.pending.values())
+
+    def enqueue(self, member: Member, nick: Optional[str]) -> None:
+        """Queues a nickname edit for the member, replacing their pending edit if there is one.
+
+        Parameters
+        ----------
+        member : `discord.Member`
+            The member whose nickname to edit.
+
+        nick : `Optional[str]`
+            The new nickname. `None` removes the nickname.
+        """
+
+        edits = self.pending.setdefault(member.guild.id, OrderedDict())
+
+        if member.id in edits:
+            NICKNAME_EDITS.inc("coalesced")
+
+        # Moved to the end, so a member who keeps changing their nickname doesn't jump the queue
+        edits.pop(member.id, None)
+        edits[member.id] = (member, nick)
+
+        if member.guild.id not in self.workers:
+            self.workers[member.guild.id] = asyncio.create_task(
+                self.work(member.guild.id)
+            )
+
+    async def work(self, guild_id: int) -> None:
+        """Applies the pending edits of the guild one at a time, until there are none left."""
+
+        bucket = self.buckets.setdefault(
+            guild_id, TokenBucket(rate=self.rate, capacity=self.burst)
+        )
+
+        try:
+            while self.pending.get(guild_id):
+                await bucket.acquire()
+
+                # Taken after waiting for the token, so that edits queued meanwhile are coalesced
+                _, (member, nick) = self.pending[guild_id].popitem(last=False)
+                await self.apply(member, nick, bucket=bucket)
+
+        finally:
+            self.workers.pop(guild_id, None)
+            self.pending.pop(guild_id, None)
+
+    async def apply(
+        self, member: Member, nick: Optional[str], *, bucket: TokenBucket
+    ) -> None:
+        for attempt in range(self.max_retries + 1):
+            try:
+                await member.edit(nick=nick)
+                NICKNAME_EDITS.inc("applied")
+                return
+
+            except discord.Forbidden:
+                NICKNAME_EDITS.inc("forbidden")
+                logger.error(f"Couldn't change the nickname of the user {member.id}")
+                return
+
+            except discord.NotFound:
+                NICKNAME_EDITS.inc("not_found")
+                return
+
+            except (
+                discord.HTTPException,
+                aiohttp.ClientError,
+                asyncio.TimeoutError,
+            ) as error:
+                # Only rate limits, server errors and connection problems are worth retrying
+                if isinstance(error, discord.HTTPException) and not (
+                    error.status == 429 or error.status >= 500
+                ):
+                    NICKNAME_EDITS.inc("failed")
+                    logger.error(
+                        f"Couldn't change the nickname of the user {member.id}: {error}"
+                    )
+                    return
+
+                # A newer nickname was queued meanwhile, which replaces this one
+                if member.id in self.pending.get(member.guild.id, {}):
+                    NICKNAME_EDITS.inc("coalesced")
+                    return
+
+                if attempt == self.max_retries:
+                    break
+
+                NICKNAME_RETRIES.inc()
+                await asyncio.sleep(self.retry_delay * 2**attempt)
+                await bucket.acquire()
+
+        NICKNAME_EDITS.inc("failed")
+        logger.error(
+            f"Gave up changing the nickname of the user {member.id} after {self.max_retries} retries"
+        )
+
+    async def close(self, *, timeout: float = 5.0) -> None:
+        """Waits up to `timeout` seconds for the pending edits to be applied, then cancels the rest.
+
+        Parameters
+        ----------
+        timeout : `float`
+            The number of seconds to wait. Defaults to `5`.
+        """
+
+        workers = list(self.workers.values())
+
+        if not workers:
+            return
+
+        _, pending = await asyncio.wait(workers, timeout=timeout)
+
+        for worker in pending:
+            worker.cancel()
+
+        if pending:
+            logger.error(
+                f"Dropped the pending nickname edits of {len(pending)} guild(s)"
+            )
+
+
+nickname_queue = NicknameQueue(**get_config().features.afk.nicknames)
+
+Gauge(
+    "nickname_edits_pending",
+    "Number of nickname edits waiting in the queue",
+    function=lambda: len(nickname_queue),
+)
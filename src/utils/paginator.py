@@ -0,0 +1,284 @@
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import discord
+from discord import ButtonStyle, Embed, Interaction, SelectOption
+from discord.ui import Button, Select, View
+
+# Discord only allows up to 25 options in a single select menu
+MAX_SELECT_OPTIONS = 25
+
+
+class LazyPaginator(View):
+    """A paginated embed menu which only builds a page's embed when it is about to be shown.
+
+    Only the current page and a small window of its neighbouring pages are kept in memory, so an open menu uses the same amount of memory no matter how many pages it has.
+
+    Parameters
+    ----------
+    interaction : `discord.Interaction`
+        The interaction which opened the menu. Only its user can navigate the menu.
+
+    page_count : `int`
+        The total number of pages.
+
+    page_builder : `Callable[[int], Embed]`
+        A function which builds the embed for the page at the provided index.
+
+    window : `int`
+        The number of pages to keep ready on either side of the current page. Defaults to `1`.
+
+    timeout : `Optional[float]`
+        The number of seconds of inactivity after which the menu stops responding. Defaults to `60`.
+    """
+
+    def __init__(
+        self,
+        interaction: Interaction,
+        *,
+        page_count: int,
+        page_builder: Callable[[int], Embed],
+        window: int = 1,
+        timeout: Optional[float] = 60.0,
+    ) -> None:
+        super().__init__(timeout=timeout)
+
+        self.interaction = interaction
+        self.page_count = page_count
+        self.page_builder = page_builder
+        self.window = window
+
+        self.current_page = 0
+        self.pages: Dict[int, Embed] = {}
+        self.message: Optional[discord.Message] = None
+
+        self.update_components()
+
+    def get_page(self, index: int) -> Embed:
+        """Returns the embed for the page at the specified index, building it if it isn't ready yet.
+
+        Parameters
+        ----------
+        index : `int`
+            The index of the page.
+
+        Returns
+        -------
+        `Embed`
+        """
+
+        if index not in self.pages:
+            self.pages[index] = self.page_builder(index)
+
+        return self.pages[index]
+
+    def prepare_window(self) -> None:
+        """Builds the pages around the current page and drops every page which is outside the window."""
+
+        start = max(self.current_page - self.window, 0)
+        end = min(self.current_page + self.window, self.page_count - 1)
+
+        for index in list(self.pages):
+            if not start <= index <= end:
+                del self.pages[index]
+
+        for index in range(start, end + 1):
+            self.get_page(index)
+
+    def update_components(self) -> None:
+        """Updates the buttons and the page select according to the current page."""
+
+        is_first = self.current_page == 0
+        is_last = self.current_page == self.page_count - 1
+
+        self.go_to_first.disabled = is_first
+        self.go_to_previous.disabled = is_first
+        self.go_to_next.disabled = is_last
+        self.go_to_last.disabled = is_last
+
+        # The select can't list every page, so it lists the pages closest to the current one
+        start = max(
+            min(
+                self.current_page - MAX_SELECT_OPTIONS // 2,
+                self.page_count - MAX_SELECT_OPTIONS,
+            ),
+            0,
+        )
+        end = min(start + MAX_SELECT_OPTIONS, self.page_count)
+
+        self.go_to.placeholder = f"Page {self.current_page + 1}/{self.page_count}"
+        self.go_to.options = [
+            SelectOption(
+                label=f"Page {index + 1}",
+                value=str(index),
+                default=index == self.current_page,
+            )
+            for index in range(start, end)
+        ]
+        self.go_to.disabled = self.page_count == 1
+
+    async def start(self) -> None:
+        """Sends the menu with its first page as a followup to the interaction."""
+
+        embed = self.get_page(0)
+        self.prepare_window()
+
+        self.message = await self.interaction.followup.send(
+            embed=embed, view=self, wait=True
+        )
+
+    async def show_page(self, interaction: Interaction, index: int) -> None:
+        """Navigates the menu to the page at the specified index.
+
+        Parameters
+        ----------
+        interaction : `discord.Interaction`
+            The interaction which triggered the navigation.
+
+        index : `int`
+            The index of the page to show.
+        """
+
+        self.current_page = max(min(index, self.page_count - 1), 0)
+
+        embed = self.get_page(self.current_page)
+        self.update_components()
+
+        await interaction.response.edit_message(embed=embed, view=self)
+
+        # Neighbouring pages are built after responding, so that navigation isn't held up by them
+        self.prepare_window()
+
+    async def interaction_check(self, interaction: Interaction) -> bool:
+        return interaction.user.id == self.interaction.user.id
+
+    async def on_timeout(self) -> None:
+        for item in self.children:
+            item.disabled = True
+
+        self.pages.clear()
+
+        if self.message is not None:
+            try:
+                await self.message.edit(view=self)
+
+            except discord.HTTPException:
+                pass
+
+    @discord.ui.button(label="Go to First", emoji="⏮️", style=ButtonStyle.secondary)
+    async def go_to_first(self, interaction: Interaction, button: Button) -> None:
+        await self.show_page(interaction, 0)
+
+    @discord.ui.button(label="Previous", emoji="⬅️", style=ButtonStyle.secondary)
+    async def go_to_previous(self, interaction: Interaction, button: Button) -> None:
+        await self.show_page(interaction, self.current_page - 1)
+
+    @discord.ui.button(label="Next", emoji="➡️", style=ButtonStyle.secondary)
+    async def go_to_next(self, interaction: Interaction, button: Button) -> None:
+        await self.show_page(interaction, self.current_page + 1)
+
+    @discord.ui.button(label="Go to Last", emoji="⏭️", style=ButtonStyle.secondary)
+    async def go_to_last(self, interaction: Interaction, button: Button) -> None:
+        await self.show_page(interaction, self.page_count - 1)
+
+    @discord.ui.select(placeholder="Navigate to page...", row=1)
+    async def go_to(self, interaction: Interaction, select: Select) -> None:
+        await self.show_page(interaction, int(select.values[0]))
+
+
+class CursorPaginator(View):
+    """A paginated embed menu whose pages are fetched one at a time using a cursor, for when the total number of pages isn't known up front.
+
+    Only the cursors of the pages visited so far are kept, so navigating back refetches the page instead of keeping its embed in memory.
+
+    Parameters
+    ----------
+    interaction : `discord.Interaction`
+        The interaction which opened the menu. Only its user can navigate the menu.
+
+    fetch_page : `Callable[[Optional[Any]], Awaitable[Tuple[Embed, Optional[Any]]]]`
+        A coroutine function which fetches the page starting at the provided cursor( `None` for the first page ), and returns its embed along with the cursor of the next page. The next cursor is `None` for the last page.
+
+    timeout : `Optional[float]`
+        The number of seconds of inactivity after which the menu stops responding. Defaults to `60`.
+    """
+
+    def __init__(
+        self,
+        interaction: Interaction,
+        *,
+        fetch_page: Callable[[Optional[Any]], Awaitable[Tuple[Embed, Optional[Any]]]],
+        timeout: Optional[float] = 60.0,
+    ) -> None:
+        super().__init__(timeout=timeout)
+
+        self.interaction = interaction
+        self.fetch_page = fetch_page
+
+        # The cursor of every page visited so far, with the current page being the last one
+        self.cursors: List[Optional[Any]] = [None]
+        self.next_cursor: Optional[Any] = None
+        self.message: Optional[discord.Message] = None
+
+    def update_components(self) -> None:
+        """Updates the buttons according to the current page."""
+
+        self.go_to_previous.disabled = len(self.cursors) == 1
+        self.go_to_next.disabled = self.next_cursor is None
+
+    async def start(self, *, ephemeral: bool = False) -> None:
+        """Fetches the first page and sends the menu as a followup to the interaction.
+
+        Parameters
+        ----------
+        ephemeral : `bool`
+            Whether the menu should only be visible to the interaction's user. Defaults to `False`.
+        """
+
+        embed, self.next_cursor = await self.fetch_page(None)
+        self.update_components()
+
+        self.message = await self.interaction.followup.send(
+            embed=embed, view=self, ephemeral=ephemeral, wait=True
+        )
+
+    async def show_page(self, interaction: Interaction) -> None:
+        """Fetches the page at the current cursor and shows it.
+
+        Parameters
+        ----------
+        interaction : `discord.Interaction`
+            The interaction which triggered the navigation.
+        """
+
+        embed, self.next_cursor = await self.fetch_page(self.cursors[-1])
+        self.update_components()
+
+        await interaction.response.edit_message(embed=embed, view=self)
+
+    async def interaction_check(self, interaction: Interaction) -> bool:
+        return interaction.user.id == self.interaction.user.id
+
+    async def on_timeout(self) -> None:
+        for item in self.children:
+            item.disabled = True
+
+        if self.message is not None:
+            try:
+                await self.message.edit(view=self)
+
+            except discord.HTTPException:
+                pass
+
+    @discord.ui.button(label="Previous", emoji="⬅️", style=ButtonStyle.secondary)
+    async def go_to_previous(self, interaction: Interaction, button: Button) -> None:
+        if len(self.cursors) > 1:
+            self.cursors.pop()
+
+        await self.show_page(interaction)
+
+    @discord.ui.button(label="Next", emoji="➡️", style=ButtonStyle.secondary)
+    async def go_to_next(self, interaction: Interaction, button: Button) -> None:
+        if self.next_cursor is not None:
+            self.cursors.append(self.next_cursor)
+
+        await self.show_page(interaction)
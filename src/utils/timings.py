@@ -0,0 +1,249 @@
+import logging
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+from discord import Interaction, InteractionType, Webhook, app_commands as app
+from discord.interactions import InteractionResponse
+
+from utils.metrics import Counter, Histogram
+
+logger = logging.getLogger("snapbot.commands")
+
+COMMANDS = Counter(
+    "app_commands_total",
+    "Number of application commands run, by command and status",
+    labels=("command", "status"),
+)
+COMMAND_LATENCY = Histogram(
+    "app_command_seconds",
+    "Time taken by each application command, from the interaction check to its completion",
+    labels=("command",),
+)
+OPERATION_LATENCY = Histogram(
+    "operation_seconds",
+    "Time taken by the timed operations, such as database queries and HTTP requests",
+    labels=("kind",),
+)
+
+
+class CommandTimings:
+    """Collects how long an application command spent on each kind of work, in milliseconds.
+
+    The durations of the same kind are added up, so work which runs concurrently( e.g. with `asyncio.gather` ) is counted once for every call.
+    """
+
+    __slots__ = ("start", "durations")
+
+    def __init__(self) -> None:
+        self.start = time.perf_counter()
+        self.durations: Dict[str, float] = defaultdict(float)
+
+    def add(self, name: str, seconds: float) -> None:
+        """Adds the provided duration to the total of the specified kind of work.
+
+        Parameters
+        ----------
+        name : `str`
+            The kind of work, e.g. `db` or `http`.
+
+        seconds : `float`
+            The time spent, in seconds.
+        """
+
+        self.durations[name] += seconds * 1000
+
+    def to_fields(self) -> Dict[str, float]:
+        """Returns the total duration of the command along with the duration of each kind of work, as `<name>_ms` fields.
+
+        Returns
+        -------
+        `Dict[str, float]`
+        """
+
+        fields = {
+            f"{name}_ms": round(duration, 2)
+            for name, duration in self.durations.items()
+        }
+        fields["duration_ms"] = round((time.perf_counter() - self.start) * 1000, 2)
+        return fields
+
+
+# The timings of the application command being handled by the current task. Tasks created while handling the command share them
+_current_timings: ContextVar[Optional[CommandTimings]] = ContextVar(
+    "command_timings", default=None
+)
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    """A context manager which records the time spent inside it in the `operation_seconds` metric, and adds it to the timings of the application command currently being handled, if any.
+
+    Parameters
+    ----------
+    name : `str`
+        The kind of work being timed, e.g. `db` or `http`.
+    """
+
+    start = time.perf_counter()
+
+    try:
+        yield
+
+    finally:
+        elapsed = time.perf_counter() - start
+        OPERATION_LATENCY.observe(elapsed, name)
+
+        timings = _current_timings.get()
+
+        if timings is not None:
+            timings.add(name, elapsed)
+
+
+class TimedInteractionResponse(InteractionResponse):
+    """An `InteractionResponse` which records the time spent deferring and responding in the interaction's timings."""
+
+    __slots__ = ()
+
+    async def defer(self, *args: Any, **kwargs: Any) -> None:
+        with timed("defer"):
+            return await super().defer(*args, **kwargs)
+
+    async def send_message(self, *args: Any, **kwargs: Any) -> None:
+        with timed("response"):
+            return await super().send_message(*args, **kwargs)
+
+    async def edit_message(self, *args: Any, **kwargs: Any) -> Any:
+        with timed("response"):
+            return await super().edit_message(*args, **kwargs)
+
+    async def send_modal(self, *args: Any, **kwargs: Any) -> None:
+        with timed("response"):
+            return await super().send_modal(*args, **kwargs)
+
+
+class TimedFollowup:
+    """Wraps the followup webhook of an interaction, recording the time spent sending and editing followup messages as responding. Everything else is passed through to the webhook.
+
+    Parameters
+    ----------
+    webhook : `discord.Webhook`
+        The followup webhook of the interaction.
+    """
+
+    __slots__ = ("webhook",)
+
+    def __init__(self, webhook: Webhook) -> None:
+        self.webhook = webhook
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.webhook, name)
+
+    async def send(self, *args: Any, **kwargs: Any) -> Any:
+        with timed("response"):
+            return await self.webhook.send(*args, **kwargs)
+
+    async def edit_message(self, *args: Any, **kwargs: Any) -> Any:
+        with timed("response"):
+            return await self.webhook.edit_message(*args, **kwargs)
+
+
+class TimedInteraction(Interaction):
+    """An `Interaction` whose response and followup record the time spent responding in its timings.
+
+    Interactions are created by discord.py, so `TimedCommandTree` switches the class of each interaction to this one before its command runs. No slots are added, so both classes share the same layout. The timed response is kept in `extras`, so that every access returns the same object, like `Interaction.response` does.
+    """
+
+    __slots__ = ()
+
+    @property
+    def response(self) -> TimedInteractionResponse:
+        response = self.extras.get("timed_response")
+
+        if response is None:
+            response = self.extras["timed_response"] = TimedInteractionResponse(self)
+
+        return response
+
+    @property
+    def followup(self) -> TimedFollowup:
+        return TimedFollowup(super().followup)
+
+    async def edit_original_response(self, *args: Any, **kwargs: Any) -> Any:
+        with timed("response"):
+            return await super().edit_original_response(*args, **kwargs)
+
+
+class TimedCommandTree(app.CommandTree):
+    """A `CommandTree` which times every application command, and logs a structured record with its timings once it completes or fails.
+
+    The record is logged to `snapbot.commands` with the command's name, the interaction's and guild's IDs, and the time spent deferring, responding( including followup messages ), querying the database and making HTTP requests as extra fields.
+    """
+
+    async def interaction_check(self, interaction: Interaction) -> bool:
+        # Autocompletions go through the same check, but aren't commands being run
+        if interaction.type is InteractionType.autocomplete:
+            return True
+
+        timings = CommandTimings()
+        interaction.extras["timings"] = timings
+        _current_timings.set(timings)
+
+        # The timed response and followup are put in place before the command runs
+        if type(interaction) is Interaction:
+            interaction.__class__ = TimedInteraction
+
+        return True
+
+    async def on_error(
+        self, interaction: Interaction, error: app.AppCommandError
+    ) -> None:
+        log_command(interaction, error=error)
+        await super().on_error(interaction, error)
+
+
+def log_command(
+    interaction: Interaction, *, error: Optional[BaseException] = None
+) -> None:
+    """Logs a structured record of the application command handled by the interaction along with its timings, and records it in the command metrics.
+
+    Parameters
+    ----------
+    interaction : `discord.Interaction`
+        The interaction which invoked the command.
+
+    error : `Optional[BaseException]`
+        The error raised by the command. Defaults to `None` if it completed successfully.
+    """
+
+    timings: Optional[CommandTimings] = interaction.extras.get("timings")
+    command = interaction.command
+
+    fields = {
+        "event": "app_command",
+        "command": command.qualified_name if command is not None else None,
+        "interaction_id": interaction.id,
+        "guild_id": interaction.guild_id,
+        "user_id": interaction.user.id,
+        "status": "ok" if error is None else "error",
+    }
+
+    if error is not None:
+        # The original exception is more useful than the wrapper discord.py puts around it
+        if isinstance(error, app.CommandInvokeError):
+            error = error.original
+
+        fields["error"] = type(error).__name__
+
+    if timings is not None:
+        fields.update(timings.to_fields())
+        COMMAND_LATENCY.observe(fields["duration_ms"] / 1000, str(fields["command"]))
+
+    COMMANDS.inc(str(fields["command"]), fields["status"])
+
+    logger.info(
+        f"/{fields['command']} {fields['status']} in {fields.get('duration_ms')}ms",
+        extra=fields,
+    )
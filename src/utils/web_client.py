@@ -0,0 +1,102 @@
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+import aiohttp
+
+from utils.timings import timed
+
+logger = logging.getLogger("snapbot")
+
+
+class WebClient:
+    """A shared HTTP client for making requests to external APIs without blocking the event loop.
+
+    Connections are kept alive and reused between requests, every request is bound by a timeout, and the number of requests in flight at once is limited so that one slow API can't pile up work.
+
+    Parameters
+    ----------
+    max_connections : `int`
+        The maximum number of open connections in the pool.
+
+    max_concurrent_requests : `int`
+        The maximum number of requests that can be in flight at the same time.
+
+    timeout : `float`
+        The total number of seconds a single request is allowed to take.
+
+    keepalive_timeout : `float`
+        The number of seconds an idle connection is kept open for reuse.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_connections: int = 20,
+        max_concurrent_requests: int = 10,
+        timeout: float = 5.0,
+        keepalive_timeout: float = 30.0,
+    ) -> None:
+        self.max_connections = max_connections
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.keepalive_timeout = keepalive_timeout
+        self.semaphore = asyncio.Semaphore(max_concurrent_requests)
+        self.session: Optional[aiohttp.ClientSession] = None
+
+    async def start(self) -> None:
+        """Opens the underlying session. Does nothing if it is already open."""
+
+        if self.session is not None and not self.session.closed:
+            return
+
+        connector = aiohttp.TCPConnector(
+            limit=self.max_connections, keepalive_timeout=self.keepalive_timeout
+        )
+        self.session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+
+    async def close(self) -> None:
+        """Closes the underlying session along with every pooled connection."""
+
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def get_json(
+        self, url: str, *, params: Optional[Dict[str, str]] = None
+    ) -> Optional[Any]:
+        """Makes a GET request to the specified URL and returns the decoded JSON response. Returns `None` if the request fails, times out or doesn't return a `200` status code.
+
+        Parameters
+        ----------
+        url : `str`
+            The URL to make the request to.
+
+        params : `Optional[Dict[str, str]]`
+            The query parameters to send along with the request. Defaults to `None`.
+
+        Returns
+        -------
+        `Optional[Any]`
+        """
+
+        await self.start()
+
+        async with self.semaphore:
+            try:
+                with timed("http"):
+                    async with self.session.get(url, params=params) as response:
+                        if response.status != 200:
+                            logger.error(
+                                f"Request to {url} failed with status code {response.status}"
+                            )
+                            return None
+
+                        return await response.json(content_type=None)
+
+            except asyncio.TimeoutError:
+                logger.error(f"Request to {url} timed out")
+                return None
+
+            except (aiohttp.ClientError, ValueError) as error:
+                logger.error(f"Request to {url} failed: {error}")
+                return None
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# The bot's modules are imported as top level packages from `src`, and `config.json` is read from the repository's root
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+sys.path.insert(0, os.path.join(ROOT, "src"))
+os.chdir(ROOT)
@@ -0,0 +1,55 @@
+import asyncio
+
+from utils.about_store import AboutStore
+
+
+class FakeCollection:
+    """Holds the about data of a single user, like the `about_data` collection would."""
+
+    def __init__(self, data: dict) -> None:
+        self.data = data
+
+    async def find_one(self, query: dict) -> dict:
+        return dict(self.data)
+
+    async def update_one(self, query: dict, update: dict, *, upsert: bool) -> None:
+        self.data.update(update.get("$set", {}))
+
+
+def test_embed_built_from_outdated_data_isnt_served() -> None:
+    coll = FakeCollection({"user_id": 1, "title": "Old"})
+    store = AboutStore(coll, max_size=16, ttl=900, negative_ttl=60)
+
+    async def main() -> None:
+        # A view reads the data, then the user edits their title before the view builds the embed
+        data = await store.get(1)
+        await store.update(1, set_fields={"title": "New"})
+        store.get_embed(1, data=data, builder=lambda data: data["title"])
+
+        data = await store.get(1)
+        assert (
+            store.get_embed(1, data=data, builder=lambda data: data["title"]) == "New"
+        )
+
+    asyncio.run(main())
+
+
+def test_embed_is_reused_for_the_same_data() -> None:
+    store = AboutStore(
+        FakeCollection({"user_id": 1}), max_size=16, ttl=900, negative_ttl=60
+    )
+    builds = []
+
+    def builder(data: dict) -> object:
+        builds.append(data)
+        return object()
+
+    async def main() -> None:
+        data = await store.get(1)
+        first = store.get_embed(1, data=data, builder=builder)
+
+        data = await store.get(1)
+        assert store.get_embed(1, data=data, builder=builder) is first
+        assert len(builds) == 1
+
+    asyncio.run(main())
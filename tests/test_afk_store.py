@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+from pymongo.errors import PyMongoError
+
+from utils.afk_store import AFKStore, afk_store
+from utils.metrics import render_metrics
+
+
+class FakeCollection:
+    def __init__(self, *, fail: bool = False) -> None:
+        self.fail = fail
+        self.documents = []
+
+    async def insert_one(self, document: dict) -> None:
+        await asyncio.sleep(0)
+
+        if self.fail:
+            raise PyMongoError("The database is down")
+
+        self.documents.append(document)
+
+
+def test_failed_insert_leaves_the_user_not_afk() -> None:
+    store = AFKStore(FakeCollection(fail=True))
+
+    with pytest.raises(PyMongoError):
+        asyncio.run(store.add({"user_id": 1}))
+
+    assert 1 not in store
+    assert store.get(1) is None
+
+
+def test_successful_insert_marks_the_user_afk() -> None:
+    coll = FakeCollection()
+    store = AFKStore(coll)
+
+    asyncio.run(store.add({"user_id": 1}))
+
+    assert store.get(1) == {"user_id": 1}
+    assert coll.documents == [{"user_id": 1}]
+
+
+def test_lookups_are_exported() -> None:
+    misses = afk_store.misses
+    afk_store.get(-1)
+
+    assert f'afk_lookups_total{{result="miss"}} {misses + 1}' in render_metrics()
+
+
+def test_failed_delete_keeps_the_user_afk() -> None:
+    class FailingCollection:
+        async def delete_one(self, query: dict) -> None:
+            raise PyMongoError("The database is down")
+
+        async def delete_many(self, query: dict) -> None:
+            raise PyMongoError("The database is down")
+
+    store = AFKStore(FailingCollection())
+    store.records = {1: {"user_id": 1}, 2: {"user_id": 2}}
+
+    with pytest.raises(PyMongoError):
+        asyncio.run(store.pop(1))
+
+    with pytest.raises(PyMongoError):
+        asyncio.run(store.pop_many([1, 2]))
+
+    assert store.records == {1: {"user_id": 1}, 2: {"user_id": 2}}
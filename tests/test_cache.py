@@ -0,0 +1,18 @@
+from utils.cache import TTLCache
+from utils.metrics import render_metrics
+
+
+def test_cache_statistics_are_exported_per_cache() -> None:
+    cache = TTLCache(max_size=1, ttl=60, name="test")
+
+    cache.get("word")
+    cache.set("word", ["definition"])
+    cache.get("word")
+    cache.set("other", ["definition"])
+
+    metrics = render_metrics()
+
+    assert 'cache_lookups_total{cache="test",result="hit"} 1' in metrics
+    assert 'cache_lookups_total{cache="test",result="miss"} 1' in metrics
+    assert 'cache_evictions_total{cache="test"} 1' in metrics
+    assert 'cache_entries{cache="test"} 1' in metrics
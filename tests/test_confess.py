@@ -0,0 +1,238 @@
+import asyncio
+import itertools
+import random
+from types import SimpleNamespace
+from typing import List, Optional
+
+import pytest
+from cryptography.fernet import Fernet
+from pymongo.errors import PyMongoError
+
+from cogs import confess
+from utils import checks, encryption
+
+# The number of confessions posted at the same time
+CONCURRENT_CONFESSIONS = 300
+
+
+class FakeChannel:
+    """A channel which records the embeds sent to it, answering each send after a random delay so that the confessions interleave."""
+
+    def __init__(self, channel_id: int) -> None:
+        self.id = channel_id
+        self.mention = f"<#{channel_id}>"
+        self.sent: List[SimpleNamespace] = []
+        self.message_ids = itertools.count(1)
+
+    async def send(
+        self, content: Optional[str] = None, *, embed=None
+    ) -> SimpleNamespace:
+        await asyncio.sleep(random.uniform(0, 0.005))
+
+        message = SimpleNamespace(
+            id=next(self.message_ids), content=content, embed=embed
+        )
+        self.sent.append(message)
+        return message
+
+
+class FakeInteraction:
+    """The parts of an interaction used by the confession commands."""
+
+    def __init__(self, user_id: int, guild_id: int) -> None:
+        self.user = SimpleNamespace(id=user_id, mention=f"<@{user_id}>")
+        self.guild_id = guild_id
+        self.guild = SimpleNamespace(id=guild_id)
+        self.deferred = False
+        self.replies: List[str] = []
+
+        self.response = SimpleNamespace(defer=self.defer)
+        self.followup = SimpleNamespace(send=self.reply)
+
+    async def defer(self, *, ephemeral: bool = False) -> None:
+        await asyncio.sleep(0)
+        self.deferred = True
+
+    async def reply(self, content: str) -> None:
+        self.replies.append(content)
+
+
+def get_field(embed, name: str) -> Optional[str]:
+    for field in embed.fields:
+        if field.name == name:
+            return field.value
+
+    return None
+
+
+@pytest.fixture
+def channels(monkeypatch: pytest.MonkeyPatch) -> dict:
+    channels = {"log": FakeChannel(1), "confession": FakeChannel(2)}
+    monkeypatch.setattr(
+        confess, "get_channel", lambda interaction, *, channel: channels[channel]
+    )
+    return channels
+
+
+@pytest.fixture
+def ledger(monkeypatch: pytest.MonkeyPatch) -> dict:
+    stored = {}
+    ids = itertools.count(1)
+
+    async def next_id() -> int:
+        await asyncio.sleep(random.uniform(0, 0.005))
+        return next(ids)
+
+    async def add(confession_id: int, **fields) -> None:
+        stored[confession_id] = fields
+
+    monkeypatch.setattr(confess.confession_ledger, "next_id", next_id)
+    monkeypatch.setattr(confess.confession_ledger, "add", add)
+    return stored
+
+
+@pytest.fixture(autouse=True)
+def encryption_key(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("ENCRYPTION_KEYS", Fernet.generate_key().decode())
+    monkeypatch.setattr(encryption, "_fernet", None)
+    monkeypatch.setattr(encryption, "_primary_fernet", None)
+
+
+def test_concurrent_confessions_keep_their_own_keys(
+    channels: dict, ledger: dict
+) -> None:
+    cog = confess.Confession(bot=None)
+    interactions = [
+        FakeInteraction(user_id=10_000 + index, guild_id=1)
+        for index in range(CONCURRENT_CONFESSIONS)
+    ]
+
+    async def main() -> None:
+        await asyncio.gather(
+            *(
+                confess.Confession.post.callback(
+                    cog,
+                    interaction,
+                    f"Confession of {interaction.user.id}",
+                    None,
+                )
+                for interaction in interactions
+            )
+        )
+
+    asyncio.run(main())
+
+    log_messages = channels["log"].sent
+    confession_messages = channels["confession"].sent
+
+    assert len(log_messages) == CONCURRENT_CONFESSIONS
+    assert len(confession_messages) == CONCURRENT_CONFESSIONS
+
+    # Every log embed's key decrypts to the ID of the user whose confession it logs
+    for message in log_messages:
+        user_id = encryption.decrypt(get_field(message.embed, "Encrypted Key"))
+        assert message.embed.description == f"Confession of {user_id}"
+
+    # The ledger stores the same key as the log embed of each confession
+    log_keys = {
+        int(get_field(message.embed, "Confession ID")): get_field(
+            message.embed, "Encrypted Key"
+        )
+        for message in log_messages
+    }
+    assert len(ledger) == CONCURRENT_CONFESSIONS
+
+    for confession_id, fields in ledger.items():
+        assert fields["ciphertext"] == log_keys[confession_id]
+
+    for interaction in interactions:
+        assert len(interaction.replies) == 1
+        assert "successfully posted" in interaction.replies[0]
+
+
+def test_unconfigured_channels_dont_reserve_an_id(
+    monkeypatch: pytest.MonkeyPatch, ledger: dict
+) -> None:
+    monkeypatch.setattr(confess, "get_channel", lambda interaction, *, channel: None)
+
+    async def next_id() -> int:
+        raise AssertionError("No confession ID should be reserved")
+
+    monkeypatch.setattr(confess.confession_ledger, "next_id", next_id)
+
+    interaction = FakeInteraction(user_id=1, guild_id=1)
+    asyncio.run(
+        confess.Confession.post.callback(
+            confess.Confession(bot=None), interaction, "Confession", None
+        )
+    )
+
+    assert len(interaction.replies) == 1
+    assert "haven't been set up" in interaction.replies[0]
+
+
+def test_ledger_outage_is_answered_through_the_followup(
+    monkeypatch: pytest.MonkeyPatch, channels: dict
+) -> None:
+    async def next_id() -> int:
+        raise PyMongoError("The database is down")
+
+    monkeypatch.setattr(confess.confession_ledger, "next_id", next_id)
+
+    interaction = FakeInteraction(user_id=1, guild_id=1)
+    asyncio.run(
+        confess.Confession.post.callback(
+            confess.Confession(bot=None), interaction, "Confession", None
+        )
+    )
+
+    assert len(interaction.replies) == 1
+    assert "couldn't be posted" in interaction.replies[0]
+    assert not channels["log"].sent and not channels["confession"].sent
+
+
+def test_guild_owner_can_only_decrypt_their_guilds_confessions(
+    monkeypatch: pytest.MonkeyPatch, channels: dict
+) -> None:
+    ciphertext = encryption.encrypt("42")
+
+    async def get(confession_id: int, *, guild_id: int) -> Optional[dict]:
+        # The lookup only happens once Discord has been told to wait
+        assert interaction.deferred
+
+        if (confession_id, guild_id) == (7, 1):
+            return {"ciphertext": ciphertext}
+
+        return None
+
+    monkeypatch.setattr(confess.confession_ledger, "get", get)
+
+    # User 1 is the owner set in the settings of guild 1 only
+    monkeypatch.setattr(
+        checks.guild_settings,
+        "get_value",
+        lambda guild_id, key: 1 if (guild_id, key) == (1, "owner") else None,
+    )
+
+    # Not the bot owner, but passes `is_owner` as the owner set in the guild's settings
+    interaction = FakeInteraction(user_id=1, guild_id=1)
+    cog = confess.Confession(bot=None)
+
+    async def main() -> None:
+        # The same checks Discord's command tree runs before invoking the command
+        assert await cog.decrypt._check_can_run(interaction)
+        assert not await cog.decrypt._check_can_run(
+            FakeInteraction(user_id=1, guild_id=2)
+        )
+        assert not await cog.decrypt._check_can_run(
+            FakeInteraction(user_id=2, guild_id=1)
+        )
+
+        await cog.decrypt.callback(cog, interaction, ciphertext)
+        await cog.decrypt.callback(cog, interaction, "7")
+
+    asyncio.run(main())
+
+    assert "Only the bot owner" in interaction.replies[0]
+    assert "**User ID**: 42" in interaction.replies[1]
+    assert len(channels["log"].sent) == 1
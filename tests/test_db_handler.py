@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+
+from utils import db_handler
+
+
+class FakeCollection:
+    """Reports the indexes a collection already has, and records the ones created."""
+
+    def __init__(self, existing: dict) -> None:
+        self.existing = existing
+        self.created = []
+
+    async def index_information(self) -> dict:
+        return self.existing
+
+    async def create_index(self, keys, **options) -> str:
+        self.created.append(options["name"])
+        return options["name"]
+
+
+def test_indexes_are_matched_by_their_keys(monkeypatch: pytest.MonkeyPatch) -> None:
+    collections = {
+        # The same index as `user_id_unique`, created under the automatic name
+        "afk_data": FakeCollection(
+            {
+                "_id_": {"key": [("_id", 1)]},
+                "user_id_1": {"key": [("user_id", 1.0)], "unique": True},
+            }
+        ),
+    }
+    monkeypatch.setattr(
+        db_handler,
+        "load_database_and_collection",
+        lambda name: collections.setdefault(name, FakeCollection({})),
+    )
+
+    asyncio.run(db_handler.ensure_indexes())
+
+    assert collections["afk_data"].created == ["expires_at_ttl"]
+    assert collections["about_data"].created == ["user_id_unique"]
@@ -0,0 +1,30 @@
+import asyncio
+import time
+
+from utils import encryption
+
+
+def test_shutdown_doesnt_block_the_event_loop() -> None:
+    async def main() -> None:
+        # Keeps the thread pool busy, like an encryption still in progress
+        loop = asyncio.get_running_loop()
+        pending = loop.run_in_executor(encryption._get_executor(), time.sleep, 0.2)
+
+        ticks = 0
+
+        async def tick() -> None:
+            nonlocal ticks
+
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.create_task(tick())
+        await encryption.async_shutdown_executor()
+        ticker.cancel()
+
+        assert pending.done()
+        assert ticks >= 5
+        assert encryption._executor is None
+
+    asyncio.run(main())
@@ -0,0 +1,23 @@
+import pytest
+
+from cogs import events
+from utils.cfg_handler import ConfigSection
+
+
+def make_config(disabled_guilds: list) -> ConfigSection:
+    return ConfigSection({"features": {"afk": {"disabled_guilds": disabled_guilds}}})
+
+
+def test_disabled_guilds_are_rebuilt_only_after_a_reload(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    config = make_config([1, 2])
+    monkeypatch.setattr(events, "get_config", lambda: config)
+
+    first = events.get_disabled_guilds()
+    assert first == frozenset({1, 2})
+    assert events.get_disabled_guilds() is first
+
+    # A reload creates new sections
+    config = make_config([3])
+    assert events.get_disabled_guilds() == frozenset({3})
@@ -0,0 +1,18 @@
+import sys
+
+from utils.gateway import get_required_intents
+
+
+def test_declared_intents_are_read_without_importing_the_extensions() -> None:
+    extensions = ["cogs.afk", "cogs.avatar", "cogs.events", "cogs.settings"]
+    imported = set(sys.modules)
+
+    assert get_required_intents(extensions) == {
+        "members",
+        "guild_messages",
+        "message_content",
+        "guilds",
+    }
+
+    # The extensions are executed once, when they're loaded into the bot
+    assert not (set(sys.modules) - imported) & set(extensions)
@@ -0,0 +1,17 @@
+import pytest
+
+from utils.key_rotation import Checkpoint
+
+
+def test_checkpoint_of_another_source_is_refused(tmp_path) -> None:
+    path = str(tmp_path / "rotate_keys.json")
+
+    checkpoint = Checkpoint(path, source="channel:1")
+    checkpoint.data["last_id"] = 1224589225694072892
+    checkpoint.save()
+
+    # Resuming the ledger from a message ID would skip every confession
+    with pytest.raises(ValueError):
+        Checkpoint(path, source="ledger")
+
+    assert Checkpoint(path, source="channel:1").last_id == 1224589225694072892
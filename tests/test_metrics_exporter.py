@@ -0,0 +1,28 @@
+import asyncio
+import socket
+
+from utils.metrics_exporter import MetricsExporter
+
+
+def test_taken_port_doesnt_stop_the_exporter() -> None:
+    # Holds a port, like another exporter already listening on it would
+    taken = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    taken.bind(("127.0.0.1", 0))
+    taken.listen()
+    port = taken.getsockname()[1]
+
+    async def main() -> None:
+        exporter = MetricsExporter(port=port)
+
+        try:
+            await exporter.start()
+            assert exporter.runner is None
+
+        finally:
+            await exporter.close()
+
+    try:
+        asyncio.run(main())
+
+    finally:
+        taken.close()
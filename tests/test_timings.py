@@ -0,0 +1,69 @@
+import asyncio
+
+import discord
+import pytest
+from discord import Interaction, InteractionType
+from discord.interactions import InteractionResponse
+
+from utils.timings import (
+    CommandTimings,
+    TimedCommandTree,
+    TimedInteraction,
+    TimedInteractionResponse,
+)
+
+
+class FakeWebhook:
+    def __init__(self) -> None:
+        self.sent = []
+
+    async def send(self, content: str) -> None:
+        await asyncio.sleep(0.01)
+        self.sent.append(content)
+
+
+def make_interaction() -> Interaction:
+    """Returns an interaction with only the attributes the timings use, like the ones discord.py creates for application commands."""
+
+    interaction = Interaction.__new__(Interaction)
+    interaction.type = InteractionType.application_command
+    interaction.extras = {}
+    return interaction
+
+
+@pytest.fixture
+def webhook(monkeypatch: pytest.MonkeyPatch) -> FakeWebhook:
+    webhook = FakeWebhook()
+    monkeypatch.setattr(Interaction, "followup", property(lambda self: webhook))
+
+    async def defer(self, *, ephemeral: bool = False) -> None:
+        await asyncio.sleep(0.01)
+
+    monkeypatch.setattr(InteractionResponse, "defer", defer)
+    return webhook
+
+
+def test_interaction_check_times_the_response(webhook: FakeWebhook) -> None:
+    tree = TimedCommandTree(discord.Client(intents=discord.Intents.none()))
+    interaction = make_interaction()
+
+    async def main() -> None:
+        assert await tree.interaction_check(interaction)
+
+        # A deferred command, which answers through the followup like most commands do
+        await interaction.response.defer()
+        await interaction.followup.send("Done!")
+
+    asyncio.run(main())
+
+    # Fails if discord.py's interactions can no longer be switched to the timed class
+    assert isinstance(interaction, TimedInteraction)
+    assert isinstance(interaction.response, TimedInteractionResponse)
+    assert interaction.response is interaction.response
+
+    timings: CommandTimings = interaction.extras["timings"]
+    fields = timings.to_fields()
+
+    assert webhook.sent == ["Done!"]
+    assert fields["defer_ms"] > 0
+    assert fields["response_ms"] > 0
@@ -0,0 +1,102 @@
+import asyncio
+import time
+
+from aiohttp import web
+
+from utils.web_client import WebClient
+
+
+async def start_stub_server(handler) -> web.AppRunner:
+    """Starts a local server which answers every GET request with the provided handler, on a free port."""
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+
+    # Handlers still hanging when the server is cleaned up are cancelled right away
+    runner = web.AppRunner(app, shutdown_timeout=0.1)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    return runner
+
+
+def get_url(runner: web.AppRunner) -> str:
+    host, port = runner.addresses[0][:2]
+    return f"http://{host}:{port}/"
+
+
+def test_hanging_request_times_out_without_blocking_the_loop() -> None:
+    async def hang(request: web.Request) -> web.Response:
+        await asyncio.sleep(60)
+        return web.json_response({})
+
+    async def main() -> None:
+        runner = await start_stub_server(hang)
+        client = WebClient(timeout=0.5)
+
+        # Counts the ticks of a coroutine running alongside the request, which only keeps ticking if the loop isn't blocked
+        ticks = 0
+
+        async def tick() -> None:
+            nonlocal ticks
+
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.create_task(tick())
+
+        try:
+            start = time.perf_counter()
+            result = await client.get_json(get_url(runner))
+            elapsed = time.perf_counter() - start
+
+        finally:
+            ticker.cancel()
+            await client.close()
+            await runner.cleanup()
+
+        assert result is None
+        assert 0.4 <= elapsed < 2.0
+        assert ticks >= 20
+
+    asyncio.run(main())
+
+
+def test_successful_request_returns_json() -> None:
+    async def answer(request: web.Request) -> web.Response:
+        return web.json_response({"list": [{"word": request.query["term"]}]})
+
+    async def main() -> None:
+        runner = await start_stub_server(answer)
+        client = WebClient(timeout=2.0)
+
+        try:
+            result = await client.get_json(get_url(runner), params={"term": "snap"})
+
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+        assert result == {"list": [{"word": "snap"}]}
+
+    asyncio.run(main())
+
+
+def test_non_200_status_returns_none() -> None:
+    async def fail(request: web.Request) -> web.Response:
+        return web.Response(status=503)
+
+    async def main() -> None:
+        runner = await start_stub_server(fail)
+        client = WebClient(timeout=2.0)
+
+        try:
+            result = await client.get_json(get_url(runner))
+
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+        assert result is None
+
+    asyncio.run(main())